@@ -1,9 +1,23 @@
 import sympy as sp
 
 from dataclasses import dataclass
+from typing import Hashable, Literal
 from qiskit.circuit import ParameterExpression
-from ..layer import QCLayer, StandardGateLayer, MeasurementLayer, BarrierLayer, MeasurementBranch
-from ..layer import construct_layer_matrix, apply_measurement_layer
+from ..gate.utils import parse_param
+from ..layer import StandardGate, FusedGate
+from ..layer import QCLayer, StandardGateLayer, MeasurementLayer, BarrierLayer, ResetLayer, MeasurementBranch, ClbitKey
+from ..layer import apply_layer_to_matrix, apply_gate_to_amplitudes, apply_measurement_layer
+from ..layer import apply_gate_to_density, apply_measurement_layer_to_density, apply_reset_layer_to_density
+from ..layer import construct_layer_matrix, is_constant_gate, apply_gates_in_domain, domain_matrix_product, matrix_power
+from ..layer import exact_domain, polynomial_domain, half_angle_domain, DomainFinder
+
+# "sympy": generic expression arithmetic, otherwise the polynomial ring of ARITHMETIC_DOMAINS
+Arithmetic = Literal["sympy", "domain", "half_angle"]
+
+ARITHMETIC_DOMAINS: dict[str, DomainFinder] = {
+    "domain": polynomial_domain,
+    "half_angle": half_angle_domain,
+}
 
 class Chunk:
     layers: list[QCLayer]
@@ -13,17 +27,150 @@ class ChunkedCircuit:
     chunks: list[Chunk | BarrierLayer]
     global_phase: float | ParameterExpression
 
+def template_placeholders(count: int) -> list[sp.Symbol]:
+    """Parameters of a chunk template, in order of first appearance in the chunk"""
+    return [sp.Symbol(f"_tpl{i}", real=True) for i in range(count)]
+
+def rename_symbols(M: sp.SparseMatrix, mapping: dict[sp.Symbol, sp.Symbol]) -> sp.SparseMatrix:
+    """
+    `M.xreplace(mapping)` with one memo shared by all entries.
+
+    Entries of a chunk matrix are sums of products of the same few gate entries, a per-entry
+    `xreplace` would rebuild these shared subexpressions once per entry.
+    """
+    memo: dict[sp.Basic, sp.Basic] = dict(mapping)
+
+    def rename(e: sp.Basic) -> sp.Basic:
+        if e in memo:
+            return memo[e]
+        if e.args:
+            args = tuple(rename(a) for a in e.args)
+            result = e.func(*args) if any(a is not b for a, b in zip(args, e.args)) else e
+        else:
+            result = e
+        memo[e] = result
+        return result
+
+    return sp.SparseMatrix(M.rows, M.cols, {ij: rename(v) for ij, v in M.todok().items()})
+
+def _gate_template_key(gate: StandardGate, symbols: dict[sp.Symbol, int]) -> Hashable:
+    # `symbols` collects the parameters in order of first appearance, they are keyed by that position
+    if isinstance(gate, FusedGate):
+        return ('fused', tuple(gate.q_idxs), tuple(_gate_template_key(g, symbols) for g in gate.gates))
+    params = []
+    for p in gate.op.params:
+        expr = sp.sympify(parse_param(p))
+        for s in sorted(expr.free_symbols, key=str):
+            symbols.setdefault(s, len(symbols))
+        placeholders = template_placeholders(len(symbols))
+        params.append(sp.srepr(expr.xreplace({s: placeholders[i] for s, i in symbols.items()})))
+    return (gate.op.name, tuple(gate.q_idxs), tuple(params))
+
 @dataclass
 class StandardGateChunk(Chunk):
     layers: list[StandardGateLayer]
+    # the layers are applied `repeat` times, e.g. the steps of `qc.repeat(k)` or of a Trotter evolution
+    repeat: int = 1
 
-    def get_matrix(self, num_qubits: int):
-        U = sp.eye(2**num_qubits)
-        for layer in self.layers:
-            U_layer = construct_layer_matrix(layer, num_qubits)
-            U = U_layer * U
+    def template_key(self) -> tuple[Hashable, list[sp.Symbol]]:
+        """
+        Structure of the chunk with its parameters renamed to `template_placeholders`, and the parameters.
+
+        Chunks with the same key (e.g. repetitions of an ansatz block with fresh parameters) have the same
+        matrix up to renaming the placeholders to their own parameters.
+        """
+        symbols: dict[sp.Symbol, int] = {}
+        key = tuple(
+            tuple(_gate_template_key(op, symbols) for op in layer.ops)
+            for layer in self.layers
+        )
+        return (key, self.repeat), list(symbols)
+
+    def get_matrix(self, num_qubits: int, arithmetic: Arithmetic = "sympy") -> sp.SparseMatrix:
+        # squaring the block matrix, or the layers applied `repeat` times if that is cheaper
+        square = self._power_pays(num_qubits, entries=4 ** num_qubits, products=0)
+        repeat, layers = (self.repeat, self.layers) if square else (1, self.layers * self.repeat)
+        find_domain = self._domain_finder(arithmetic, inputs_constant=True)
+        if find_domain is not None:
+            U = domain_matrix_product([construct_layer_matrix(layer, num_qubits) for layer in layers], find_domain, repeat)
+            if U is not None:
+                return U
+        U = sp.SparseMatrix.eye(2**num_qubits)
+        for layer in layers:
+            U = apply_layer_to_matrix(layer, U, num_qubits)
+        return matrix_power(U, repeat, self.is_monomial) if repeat > 1 else U
+
+    @property
+    def is_constant(self) -> bool:
+        """True if no gate has free parameters, such chunks are evaluated in an exact domain when possible."""
+        return all(is_constant_gate(op) for layer in self.layers for op in layer.ops)
+
+    @property
+    def is_monomial(self) -> bool:
+        """True if every gate is diagonal or monomial, the chunk then only moves and scales matrix rows."""
+        return all(op.is_diagonal or op.is_monomial for layer in self.layers for op in layer.ops)
+
+    def _domain_finder(self, arithmetic: Arithmetic, inputs_constant: bool) -> DomainFinder | None:
+        # constant gates on a constant input are always evaluated exactly, anything else only on request
+        if arithmetic in ARITHMETIC_DOMAINS:
+            return ARITHMETIC_DOMAINS[arithmetic]
+        if inputs_constant and self.is_constant:
+            return exact_domain
+        return None
+
+    def _power_pays(self, num_qubits: int, entries: int, products: int) -> bool:
+        # `repeat` passes of the gates over the `entries` of a state, against the dense 2^n x 2^n
+        # products of squaring the chunk matrix and the `products` with the state
+        if self.repeat == 1:
+            return False
+        dim = 2 ** num_qubits
+        gate_passes = self.repeat * sum(len(layer.ops) for layer in self.layers) * entries
+        return 2 * self.repeat.bit_length() * dim ** 3 + products * dim * entries < gate_passes
+
+    def apply_to_matrix(self, U: sp.SparseMatrix, num_qubits: int) -> sp.SparseMatrix:
+        for layer in self.layers * self.repeat:
+            U = apply_layer_to_matrix(layer, U, num_qubits)
         return U
 
+    def apply_to_state(self, state: sp.Matrix, num_qubits: int, arithmetic: Arithmetic = "sympy") -> sp.Matrix:
+        if self._power_pays(num_qubits, entries=state.rows, products=1):
+            return sp.Matrix(self.get_matrix(num_qubits, arithmetic) * state)
+        find_domain = self._domain_finder(arithmetic, inputs_constant=not state.free_symbols)
+        if find_domain is not None:
+            gates = [(op.sym_matrix, op.q_idxs) for layer in self.layers for op in layer.ops] * self.repeat
+            amplitudes = apply_gates_in_domain(gates, list(state), num_qubits, find_domain)
+            if amplitudes is not None:
+                return sp.Matrix(amplitudes)
+        amplitudes = list(state)
+        for _ in range(self.repeat):
+            for layer in self.layers:
+                for op in layer.ops:
+                    amplitudes = apply_gate_to_amplitudes(op, amplitudes, num_qubits)
+        return sp.Matrix(amplitudes)
+
+    def apply_to_density(self, entries: list[sp.Expr], num_qubits: int, arithmetic: Arithmetic = "sympy") -> list[sp.Expr]:
+        if self._power_pays(num_qubits, entries=len(entries), products=2):
+            dim = 2 ** num_qubits
+            U = self.get_matrix(num_qubits, arithmetic)
+            return list(U * sp.Matrix(dim, dim, entries) * U.H)
+        inputs_constant = not any(sp.sympify(e).free_symbols for e in entries)
+        find_domain = self._domain_finder(arithmetic, inputs_constant)
+        if find_domain is not None:
+            # U on the row qubits and conj(U) on the column qubits, as in `apply_gate_to_density`
+            gates = [
+                gate
+                for layer in self.layers for op in layer.ops
+                for gate in [(op.sym_matrix, [q + num_qubits for q in op.q_idxs]), (op.sym_matrix.conjugate(), op.q_idxs)]
+            ] * self.repeat
+            domain_entries = apply_gates_in_domain(gates, entries, 2 * num_qubits, find_domain)
+            if domain_entries is not None:
+                return domain_entries
+        for _ in range(self.repeat):
+            for layer in self.layers:
+                for op in layer.ops:
+                    entries = apply_gate_to_density(op, entries, num_qubits)
+        return entries
+
 @dataclass
 class MeasurementChunk(Chunk):
     layers: list[MeasurementLayer]
@@ -31,4 +178,23 @@ class MeasurementChunk(Chunk):
     def apply_measurement(self, current_branches: list[MeasurementBranch]):
         for layer in self.layers:
             current_branches = apply_measurement_layer(current_branches, layer)
-        return current_branches
\ No newline at end of file
+        return current_branches
+
+    def apply_to_density(
+        self,
+        states: dict[ClbitKey, list[sp.Expr]],
+        num_qubits: int,
+        condition_on_clbits: bool
+    ) -> dict[ClbitKey, list[sp.Expr]]:
+        for layer in self.layers:
+            states = apply_measurement_layer_to_density(states, layer, num_qubits, condition_on_clbits)
+        return states
+
+@dataclass
+class ResetChunk(Chunk):
+    layers: list[ResetLayer]
+
+    def apply_to_density(self, entries: list[sp.Expr], num_qubits: int) -> list[sp.Expr]:
+        for layer in self.layers:
+            entries = apply_reset_layer_to_density(entries, layer, num_qubits)
+        return entries
@@ -1,23 +1,98 @@
-from qiskit import QuantumCircuit, transpile
-from qiskit.circuit import Instruction
+from dataclasses import dataclass
+from typing import Hashable
 
-from .base import QCLayer, Chunk, ChunkedCircuit, StandardGateChunk, MeasurementChunk, StandardGateLayer, BarrierLayer, MeasurementLayer
-from ..layer import circuit_to_layers
+from qiskit import QuantumCircuit
+from qiskit.circuit import ControlledGate, Instruction, Parameter, ParameterExpression
+
+from .base import _gate_template_key, QCLayer, Chunk, ChunkedCircuit, StandardGateChunk, MeasurementChunk, ResetChunk, StandardGateLayer, BarrierLayer, MeasurementLayer, ResetLayer
+from ..layer import circuit_to_layers, circuit_instructions, operations_to_layers, FlatInstruction
 from ..gate import SUPPORTED_GATES
+from ..gate.utils import parse_param
+
+@dataclass
+class FlatCircuit:
+    """Circuit decomposed to supported operations, as instructions on qubit and clbit indices"""
+    num_qubits: int
+    num_clbits: int
+    instructions: list[FlatInstruction]
+    # global phase of the circuit plus the global phases of the inlined definitions
+    global_phase: float | ParameterExpression
+
+    def compose(self, other: "FlatCircuit") -> "FlatCircuit":
+        # same as `QuantumCircuit.compose`: the qubits and clbits of `other` map to the first ones of `self`
+        return FlatCircuit(
+            self.num_qubits, self.num_clbits,
+            self.instructions + other.instructions,
+            self.global_phase + other.global_phase,
+        )
+
+def circuit_to_chunks(qc: QuantumCircuit, fusion_width: int | None = None) -> ChunkedCircuit:
+    return decomposed_circuit_to_chunks(decompose_circuit(qc), fusion_width)
+
+def decompose_circuit(qc: QuantumCircuit) -> FlatCircuit:
+    supported_gates = SUPPORTED_GATES | {'delay','measure','barrier','reset'}
+    return decompose_to_standard_gates(qc, supported_gates, unsupported_gates=set())
+
+def decomposed_circuit_to_chunks(
+    decomposed: FlatCircuit,
+    fusion_width: int | None = None
+) -> ChunkedCircuit:
+    layers = circuit_to_layers(decomposed.instructions, fusion_width)
+    return ChunkedCircuit(fold_repeated_chunks(layers_to_chunks(layers)), parse_param(decomposed.global_phase))
 
-def circuit_to_chunks(qc: QuantumCircuit) -> ChunkedCircuit:
-    supported_gates = SUPPORTED_GATES | {'delay','measure','barrier'}
-    unsupported_gates = {'reset','global_phase'}
-    decomposed_qc = decompose_to_standard_gates(qc, supported_gates, unsupported_gates)
-    layers = circuit_to_layers(decomposed_qc)
-    return ChunkedCircuit(layers_to_chunks(layers), qc.global_phase)
+@dataclass
+class _FlatDefinition:
+    """Flattened definition of an instruction on the indices of its own qubits and clbits"""
+    instructions: list[FlatInstruction]
+    global_phase: float | ParameterExpression
+    # placeholders bound to the parameters of each instance, None if the definition is used as is
+    placeholders: list[Parameter] | None
+    # keeps the definition alive, so that the `id()` in its cache key is never reused
+    source: QuantumCircuit
+
+def _bind_param(p, values: dict[Parameter, object]):
+    if not isinstance(p, ParameterExpression):
+        return p
+    for param in p.parameters & values.keys():
+        p = p.assign(param, values[param])
+    return p if p.parameters else p.numeric()
+
+def _standard_gate_template(op: Instruction) -> Instruction | None:
+    """
+    Copy of a qiskit standard gate with placeholder parameters, None for other instructions.
+
+    Definitions of standard gates only depend on the gate and its parameters, so the flattened
+    definition of the template holds for every instance once its parameters are bound.
+    """
+    if getattr(op, '_standard_gate', None) is None:
+        return None
+    if not all(isinstance(p, (int, float, ParameterExpression)) for p in op.params):
+        return None
+    placeholders = [Parameter(f"_p{i}") for i in range(len(op.params))]
+    kwargs = {'ctrl_state': op.ctrl_state} if isinstance(op, ControlledGate) else {}
+    try:
+        template = op.base_class(*placeholders, **kwargs)
+    except TypeError:
+        return None
+    if (template.name, template.num_qubits, template.num_clbits) != (op.name, op.num_qubits, op.num_clbits):
+        return None
+    return template
 
 def decompose_to_standard_gates(
     quantum_circuit: QuantumCircuit,
     supported_gates: set[str],
     unsupported_gates: set[str]
-) -> QuantumCircuit:
-    
+) -> FlatCircuit:
+    """
+    Inline every instruction that is not supported by its definition, recursively and in a single pass.
+
+    The flattened definition of each instruction is computed once and reused for later instances:
+    per definition object for custom instructions, per gate and parameter arity for qiskit's standard
+    gates, whose parameters are then bound into it. Global phases of the definitions and
+    `global_phase` instructions are accumulated into the global phase of the result.
+    """
+    definitions: dict[Hashable, _FlatDefinition] = {}
+
     def needs_decompose(op: Instruction):
         return (
             op.name not in supported_gates
@@ -25,39 +100,61 @@ def decompose_to_standard_gates(
             and op.definition is not None
         )
 
-    qc = quantum_circuit
-
-    while True:
-        decomposed = False
-        new_qc = QuantumCircuit(*qc.qregs, *qc.cregs)
-
-        for ins in qc.data:
-            op: Instruction = ins.operation
-            qargs, cargs = ins.qubits, ins.clbits
-
+    def flatten(instructions: list[FlatInstruction], global_phase):
+        flat = []
+        for op, qubits, clbits in instructions:
             if op.name in unsupported_gates:
                 raise ValueError(f"Unsupported gate '{op.name}' encountered.")
-
-            if needs_decompose(op):
-                sub_qc: QuantumCircuit | None = op.definition.copy()
-                sub_qc = sub_qc.assign_parameters(op.params)
-                sub_qc = sub_qc.decompose()
-
-                for sub_ins in sub_qc.data:
-                    new_qc.append(
-                        sub_ins.operation,
-                        [qargs[i] for i in range(len(sub_ins.qubits))],
-                        cargs
-                    )
-                decomposed = True
+            if op.name == 'global_phase':
+                global_phase = global_phase + op.params[0]
+            elif needs_decompose(op):
+                sub_instructions, sub_phase = expand(op)
+                flat.extend(
+                    FlatInstruction(sub_op, tuple(qubits[q] for q in sub_q), tuple(clbits[c] for c in sub_c))
+                    for sub_op, sub_q, sub_c in sub_instructions
+                )
+                global_phase = global_phase + sub_phase
             else:
-                new_qc.append(op, qargs, cargs)
+                flat.append(FlatInstruction(op, qubits, clbits))
+        return flat, global_phase
+
+    def flatten_definition(definition: QuantumCircuit, placeholders: list[Parameter] | None) -> _FlatDefinition:
+        instructions, phase = flatten(circuit_instructions(definition), definition.global_phase)
+        return _FlatDefinition(instructions, phase, placeholders, definition)
+
+    def expand_definition(op: Instruction) -> tuple[list[FlatInstruction], float | ParameterExpression]:
+        # custom instructions carry their definition as data, shared by repeated appends of one instruction
+        definition = op.definition
+        key = ('definition', op.name, id(definition), len(op.params))
+        if key not in definitions:
+            definitions[key] = flatten_definition(definition, None)
+        return definitions[key].instructions, definitions[key].global_phase
+
+    def expand(op: Instruction) -> tuple[list[FlatInstruction], float | ParameterExpression]:
+        if getattr(op, '_standard_gate', None) is None:
+            return expand_definition(op)
+        key = ('standard', op.name, op.num_qubits, op.num_clbits, len(op.params), getattr(op, 'ctrl_state', None))
+        if key not in definitions:
+            template = _standard_gate_template(op)
+            if template is None:
+                return expand_definition(op)
+            # flattened once with placeholder parameters, bound to the parameters of each instance
+            definitions[key] = flatten_definition(template.definition, list(template.params) or None)
 
-        qc = new_qc
-        if not decomposed:
-            break
+        entry = definitions[key]
+        if entry.placeholders is None:
+            return entry.instructions, entry.global_phase
+        values = dict(zip(entry.placeholders, op.params))
+        bound = []
+        for sub_op, sub_q, sub_c in entry.instructions:
+            if any(isinstance(p, ParameterExpression) for p in sub_op.params):
+                sub_op = sub_op.copy()
+                sub_op.params = [_bind_param(p, values) for p in sub_op.params]
+            bound.append(FlatInstruction(sub_op, sub_q, sub_c))
+        return bound, _bind_param(entry.global_phase, values)
 
-    return qc
+    instructions, global_phase = flatten(circuit_instructions(quantum_circuit), quantum_circuit.global_phase)
+    return FlatCircuit(quantum_circuit.num_qubits, quantum_circuit.num_clbits, instructions, global_phase)
 
 def layers_to_chunks(layers: list[QCLayer]) -> list[Chunk | BarrierLayer]:
     result = []
@@ -70,6 +167,8 @@ def layers_to_chunks(layers: list[QCLayer]) -> list[Chunk | BarrierLayer]:
             result.append(StandardGateChunk(current_chunk.copy()))
         elif all(isinstance(l, MeasurementLayer) for l in current_chunk):
             result.append(MeasurementChunk(current_chunk.copy()))
+        elif all(isinstance(l, ResetLayer) for l in current_chunk):
+            result.append(ResetChunk(current_chunk.copy()))
         else:
             raise ValueError("Mixed layer types within chunk.")
         current_chunk.clear()
@@ -85,3 +184,55 @@ def layers_to_chunks(layers: list[QCLayer]) -> list[Chunk | BarrierLayer]:
 
     flush_chunk()
     return result
+
+def _period(keys: list[Hashable]) -> int:
+    # smallest p such that keys is keys[:p] repeated, from the prefix function of keys
+    prefix = [0] * len(keys)
+    for i in range(1, len(keys)):
+        j = prefix[i - 1]
+        while j and keys[i] != keys[j]:
+            j = prefix[j - 1]
+        prefix[i] = j + 1 if keys[i] == keys[j] else j
+    p = len(keys) - prefix[-1]
+    return p if len(keys) % p == 0 else len(keys)
+
+def _fold_periodic(chunk: StandardGateChunk) -> StandardGateChunk:
+    # the gates are compared with their actual parameters, a block repeated with fresh parameters doesn't fold
+    ops = [op for layer in chunk.layers for op in layer.ops]
+    symbols: dict = {}
+    p = _period([_gate_template_key(op, symbols) for op in ops])
+    if p == len(ops):
+        return chunk
+    return StandardGateChunk(operations_to_layers(ops[:p]), chunk.repeat * (len(ops) // p))
+
+def _block_identity(chunk: StandardGateChunk) -> Hashable:
+    (key, _), symbols = chunk.template_key()
+    return key, tuple(symbols)
+
+def fold_repeated_chunks(chunks: list[Chunk | BarrierLayer]) -> list[Chunk | BarrierLayer]:
+    """
+    Replace identical consecutive gate blocks by one `StandardGateChunk` with a `repeat` count.
+
+    Blocks repeat inside a chunk (`qc.repeat(k)`, Trotter steps with shared parameters) or as consecutive
+    chunks separated by unlabelled barriers, which are dropped. Labelled barriers are kept, the state
+    after them must stay queryable.
+    """
+    result: list[Chunk | BarrierLayer] = []
+    # index in `result` of the last gate chunk, if only unlabelled barriers follow it
+    last = None
+    for chunk in chunks:
+        if isinstance(chunk, BarrierLayer) and chunk.label is None and last is not None:
+            result.append(chunk)
+            continue
+        if not isinstance(chunk, StandardGateChunk):
+            result.append(chunk)
+            last = None
+            continue
+        chunk = _fold_periodic(chunk)
+        if last is not None and _block_identity(result[last]) == _block_identity(chunk):
+            del result[last + 1:]
+            result[last] = StandardGateChunk(result[last].layers, result[last].repeat + chunk.repeat)
+            continue
+        result.append(chunk)
+        last = len(result) - 1
+    return result
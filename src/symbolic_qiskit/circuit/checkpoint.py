@@ -0,0 +1,23 @@
+from dataclasses import dataclass
+
+@dataclass(frozen=True)
+class CheckpointPolicy:
+    """
+    Which computed states (statevectors, branch lists or density matrices) the backend keeps.
+
+    Attributes:
+        every: keep the state at every `every`-th labelled barrier (in circuit order, starting with the first)
+            as a checkpoint. None keeps every computed state, which is the default.
+        cache_size: number of other recently queried states kept in an LRU, only used if `every` is set.
+            Evicted states are recomputed on demand from the nearest earlier checkpoint.
+
+    The initial and the final state are always checkpoints.
+    """
+    every: int | None = None
+    cache_size: int = 8
+
+    def __post_init__(self):
+        if self.every is not None and self.every < 1:
+            raise ValueError(f"Invalid checkpoint interval: {self.every}. Must be a positive integer or None.")
+        if self.cache_size < 1:
+            raise ValueError(f"Invalid snapshot cache size: {self.cache_size}. Must be a positive integer.")
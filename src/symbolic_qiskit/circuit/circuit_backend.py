@@ -1,24 +1,53 @@
+from collections import OrderedDict
+
 import sympy as sp
 
-from .base import Chunk, BarrierLayer, StandardGateChunk, MeasurementChunk
+from .base import Chunk, BarrierLayer, StandardGateChunk, MeasurementChunk, ResetChunk, Arithmetic, ARITHMETIC_DOMAINS
+from .base import template_placeholders, rename_symbols
+from .simplify import SimplifyOptions, SimplifyStrategy, simplify_matrix
+from .shared import SubexpressionTable, SharedState
+from .checkpoint import CheckpointPolicy
+from ..layer import multiply_monomial, domain_matrix_product
+from ..gate.cache import LRUCache
 
 class CircuitBackend:
 
-    def __init__(self, 
+    def __init__(self,
         chunks: list[Chunk|BarrierLayer],
         num_qubits: int,
         simplify_on_build: bool,
-        global_phase: float|sp.Expr
+        global_phase: float|sp.Expr,
+        simplify_options: SimplifyOptions | None = None,
+        shared_subexpressions: bool = False,
+        checkpoint_policy: CheckpointPolicy | None = None,
+        arithmetic: Arithmetic = "sympy",
     ):
         self.chunks = chunks
         self.num_qubits = num_qubits
         self.label_to_idx: dict[str, int] = self._build_label_index()
-        self.chunk_matrices: list[sp.Matrix | None] = [
-            chunk.get_matrix(num_qubits) if isinstance(chunk, StandardGateChunk) else None
-            for chunk in chunks]
-        
+        # barrier position -> its rank among the labelled barriers, for the checkpoint interval
+        self.label_ordinals: dict[int, int] = {idx: n for n, idx in enumerate(sorted(self.label_to_idx.values()))}
+        self.checkpoint_policy = checkpoint_policy or CheckpointPolicy()
+        # sparse chunk matrices are only needed by `unitary()`, built on first use
+        self.chunk_matrices: dict[int, sp.SparseMatrix] = {}
+        # template key -> chunk matrix with `template_placeholders` for parameters, shared by repeated blocks
+        self.chunk_templates = LRUCache(maxsize=None)
+
         self.simplify_on_build = simplify_on_build
+        self.arithmetic = arithmetic
         self.global_phase = global_phase
+        self.simplify_options = simplify_options or SimplifyOptions()
+        # if set, snapshots are stored reduced against this table and expanded on query
+        self.subexpressions = SubexpressionTable() if shared_subexpressions else None
+
+        # position p -> state after chunks[:p], computed on first query
+        self.snapshots: dict[int, object] = {0: self._initial_state()}
+        # whether snapshots[p] is simplified with the default `simplify_options`
+        self.snapshot_is_simplified: dict[int, bool] = {0: True}
+        # (position, options key) -> state simplified with a non-default strategy
+        self.simplified_snapshots: dict[tuple, object] = {}
+        # positions of non-checkpoint snapshots, least recently queried first
+        self.recent_snapshots: OrderedDict[int, None] = OrderedDict()
 
     def _build_label_index(self) -> dict[str, int]:
         label_map = {}
@@ -28,11 +57,11 @@ class CircuitBackend:
                     raise ValueError(f"Duplicate barrier label: {chunk.label}")
                 label_map[chunk.label] = i
         return label_map
-    
+
     @property
     def barrier_labels(self) -> list[str]:
         return list(self.label_to_idx.keys())
-    
+
     def _resolve_barrier(self, label: str | None) -> int:
         if label is None or label == 'None':
             raise ValueError("Cannot resolve a barrier with label=None")
@@ -41,8 +70,219 @@ class CircuitBackend:
                 f"Barrier label '{label}' not found. Available labels: {self.barrier_labels}"
             )
         return self.label_to_idx[label]
-    
-    def unitary(self, start: str | None, end: str | None, simplify: bool) -> sp.Matrix:
+
+    def _resolve_position(self, label: str | None) -> int:
+        # a barrier is a no-op, the state at it is the state after all chunks before it
+        return len(self.chunks) if label is None else self._resolve_barrier(label)
+
+    def _is_checkpoint(self, position: int) -> bool:
+        # the initial state, the final state and former final states (before `extend()`) are always kept
+        every = self.checkpoint_policy.every
+        if every is None or position not in self.label_ordinals:
+            return True
+        return self.label_ordinals[position] % every == 0
+
+    def _touch(self, position: int) -> None:
+        # LRU over non-checkpoint snapshots, evicted ones are recomputed from the nearest checkpoint
+        if self._is_checkpoint(position):
+            return
+        self.recent_snapshots[position] = None
+        self.recent_snapshots.move_to_end(position)
+        while len(self.recent_snapshots) > self.checkpoint_policy.cache_size:
+            evicted, _ = self.recent_snapshots.popitem(last=False)
+            self.snapshots.pop(evicted, None)
+            self.snapshot_is_simplified.pop(evicted, None)
+            for key in [k for k in self.simplified_snapshots if k[0] == evicted]:
+                del self.simplified_snapshots[key]
+
+    def extend(self, chunks: list[Chunk | BarrierLayer], global_phase: float | sp.Expr) -> None:
+        # snapshots stay valid: the state after chunks[:p] doesn't depend on what follows,
+        # except for the global phase of the appended segment
+        previous = self.chunks
+        self.chunks = previous + chunks
+        try:
+            self.label_to_idx = self._build_label_index()
+        except ValueError:
+            self.chunks = previous
+            raise
+        self.label_ordinals = {idx: n for n, idx in enumerate(sorted(self.label_to_idx.values()))}
+
+        if global_phase != 0:
+            factor = sp.exp(sp.I * global_phase)
+            self.global_phase = self.global_phase + global_phase
+            self.snapshots = {p: self._apply_phase(s, factor) for p, s in self.snapshots.items()}
+            self.simplified_snapshots = {k: self._apply_phase(s, factor) for k, s in self.simplified_snapshots.items()}
+
+    def _initial_state(self):
+        raise NotImplementedError
+
+    def _apply_phase(self, state, factor: sp.Expr):
+        raise NotImplementedError
+
+    def _apply_chunk(self, chunk: Chunk | BarrierLayer, state):
+        raise NotImplementedError
+
+    def _apply_chunks(self, chunks: list[Chunk | BarrierLayer], state):
+        # chunks between two labelled barriers, subclasses may evolve them in one go
+        for chunk in chunks:
+            state = self._apply_chunk(chunk, state)
+        return state
+
+    def _simplify_state(self, state, options: SimplifyOptions):
+        raise NotImplementedError
+
+    def _state_exprs(self, state) -> list[sp.Expr]:
+        raise NotImplementedError
+
+    def _rebuild_state(self, state, exprs: list[sp.Expr]):
+        raise NotImplementedError
+
+    def _compress(self, state):
+        if self.subexpressions is None:
+            return state
+        return self._rebuild_state(state, self.subexpressions.compress(self._state_exprs(state)))
+
+    def _expand(self, state):
+        if self.subexpressions is None:
+            return state
+        return self._rebuild_state(state, self.subexpressions.expand(self._state_exprs(state)))
+
+    def _resolve_simplify(
+        self, simplify: bool | SimplifyStrategy, workers: int | None = None
+    ) -> SimplifyOptions | None:
+        # simplify=False -> None, True -> default options, strategy -> default options with that strategy
+        if simplify is False:
+            return None
+        strategy = None if simplify is True else simplify
+        return self.simplify_options.with_overrides(strategy, workers)
+
+    def _evolve_to(self, position: int):
+        # evolve from the nearest computed snapshot before `position` and memoize the result
+        if position not in self.snapshots:
+            start = max(p for p in self.snapshots if p < position)
+            state = self.snapshots[start]
+            stops = [i for i in self.label_to_idx.values() if start < i < position] + [position]
+            i = start
+            for stop in sorted(stops):
+                if i not in self.snapshots and self._is_checkpoint(i):
+                    # keep checkpoints passed on the way, they cost nothing extra to record
+                    state = self._compress(state)
+                    self.snapshots[i] = state
+                    self.snapshot_is_simplified[i] = False
+                state = self._apply_chunks(self.chunks[i:stop], state)
+                i = stop
+            self.snapshots[position] = self._compress(state)
+            self.snapshot_is_simplified[position] = False
+        self._touch(position)
+        return self.snapshots[position]
+
+    def _simplified_snapshot(self, position: int, options: SimplifyOptions | None = None):
+        # if not simplified yet, simplify and cache result
+        # if simplified, return from cache
+        options = options or self.simplify_options
+        state = self._evolve_to(position)
+        if options.key == self.simplify_options.key:
+            if not self.snapshot_is_simplified[position]:
+                state = self._simplify_reduced(state, options)
+                self.snapshots[position] = state
+                self.snapshot_is_simplified[position] = True
+            return state
+
+        key = (position, options.key)
+        if key not in self.simplified_snapshots:
+            self.simplified_snapshots[key] = self._simplify_reduced(state, options)
+        return self.simplified_snapshots[key]
+
+    def _simplify_reduced(self, state, options: SimplifyOptions):
+        # simplification must see the full expressions, not the opaque table symbols
+        return self._compress(self._simplify_state(self._expand(state), options))
+
+    def _snapshot(self, position: int):
+        if self.simplify_on_build:
+            return self._simplified_snapshot(position)
+        return self._evolve_to(position)
+
+    def _query(self, label: str | None, simplify: bool | SimplifyStrategy, expand: bool = True):
+        position = self._resolve_position(label)
+        options = self._resolve_simplify(simplify)
+        state = self._simplified_snapshot(position, options) if options else self._snapshot(position)
+        return self._expand(state) if expand else state
+
+    def shared_state(self, label: str | None, simplify: bool | SimplifyStrategy) -> SharedState:
+        state = self._query(label, simplify, expand=False)
+        if self.subexpressions is None:
+            return SharedState([], state)
+        return SharedState(self.subexpressions.dependencies(self._state_exprs(state)), state)
+
+    def _chunk_matrix(self, idx: int) -> sp.SparseMatrix:
+        if idx not in self.chunk_matrices:
+            self.chunk_matrices[idx] = self._instantiate_template(self.chunks[idx])
+        return self.chunk_matrices[idx]
+
+    def _instantiate_template(self, chunk: StandardGateChunk) -> sp.SparseMatrix:
+        # a repeated block costs one `xreplace` of its template instead of a symbolic matrix product
+        key, symbols = chunk.template_key()
+        placeholders = template_placeholders(len(symbols))
+        matrix = None
+
+        def build() -> sp.SparseMatrix:
+            nonlocal matrix
+            matrix = chunk.get_matrix(self.num_qubits, self.arithmetic)
+            return rename_symbols(matrix, dict(zip(symbols, placeholders))) if symbols else matrix
+
+        template = self.chunk_templates.get(key, build)
+        if matrix is not None:
+            return matrix
+        return rename_symbols(template, dict(zip(placeholders, symbols))) if symbols else template
+
+    def precompute(self) -> None:
+        for i, chunk in enumerate(self.chunks):
+            if isinstance(chunk, StandardGateChunk):
+                self._chunk_matrix(i)
+        for label in self.barrier_labels + [None]:
+            self._snapshot(self._resolve_position(label))
+
+    def simplify(self, strategy: SimplifyStrategy | None = None, workers: int | None = None) -> None:
+        options = self.simplify_options.with_overrides(strategy, workers)
+        for label in self.barrier_labels + [None]:
+            self._simplified_snapshot(self._resolve_position(label), options)
+
+    @property
+    def cache_state(self) -> tuple:
+        # changes whenever new symbolic work has been memoized
+        return (
+            len(self.snapshots),
+            sum(self.snapshot_is_simplified.values()),
+            len(self.simplified_snapshots),
+            len(self.chunk_matrices),
+            len(self.subexpressions) if self.subexpressions is not None else 0,
+        )
+
+    def export_cache(self) -> dict:
+        # results of callable strategies are not persisted, they have no stable identity across runs
+        return {
+            'chunks': self.chunks,
+            'snapshots': self.snapshots,
+            'snapshot_is_simplified': self.snapshot_is_simplified,
+            'simplified_snapshots': {
+                key: state for key, state in self.simplified_snapshots.items()
+                if isinstance(key[1][0], str)
+            },
+            'chunk_matrices': self.chunk_matrices,
+            'subexpressions': self.subexpressions.definitions if self.subexpressions is not None else {},
+        }
+
+    def import_cache(self, payload: dict) -> None:
+        self.snapshots.update(payload['snapshots'])
+        self.snapshot_is_simplified.update(payload['snapshot_is_simplified'])
+        self.simplified_snapshots.update(payload['simplified_snapshots'])
+        self.chunk_matrices.update(payload['chunk_matrices'])
+        for position in payload['snapshots']:
+            self._touch(position)
+        if self.subexpressions is not None:
+            self.subexpressions.definitions.update(payload['subexpressions'])
+
+    def unitary(self, start: str | None, end: str | None, simplify: bool | SimplifyStrategy) -> sp.Matrix:
         if start is None:
             start_idx = 0
         else:
@@ -52,14 +292,30 @@ class CircuitBackend:
             end_idx = len(self.chunks)
         else:
             end_idx = self._resolve_barrier(end)
-        
+
         for i in range(start_idx, end_idx):
             if isinstance(self.chunks[i], MeasurementChunk):
                 raise ValueError(f"Cannot compute unitary: measurement found: {self.chunks[i]}")
+            if isinstance(self.chunks[i], ResetChunk):
+                raise ValueError(f"Cannot compute unitary: reset found: {self.chunks[i]}")
 
-        U: sp.Matrix = sp.eye(2 ** self.num_qubits)
-        for matrix in self.chunk_matrices[start_idx:end_idx]:
-            if matrix is not None:
-                U = matrix @ U
+        gate_chunks = [i for i in range(start_idx, end_idx) if isinstance(self.chunks[i], StandardGateChunk)]
+        U = None
+        if self.arithmetic in ARITHMETIC_DOMAINS and gate_chunks:
+            U = domain_matrix_product([self._chunk_matrix(i) for i in gate_chunks], ARITHMETIC_DOMAINS[self.arithmetic])
+        if U is None:
+            U = self._multiply_chunk_matrices(start_idx, end_idx)
 
-        return U.applyfunc(sp.simplify) if simplify else U
+        options = self._resolve_simplify(simplify)
+        if options:
+            U = simplify_matrix(U, options)
+        return sp.Matrix(U)
+
+    def _multiply_chunk_matrices(self, start_idx: int, end_idx: int) -> sp.SparseMatrix:
+        U: sp.SparseMatrix = sp.SparseMatrix.eye(2 ** self.num_qubits)
+        for i in range(start_idx, end_idx):
+            chunk = self.chunks[i]
+            if isinstance(chunk, StandardGateChunk):
+                # a monomial chunk matrix only moves and rescales the rows of the running product
+                U = multiply_monomial(self._chunk_matrix(i), U) if chunk.is_monomial else self._chunk_matrix(i) * U
+        return U
@@ -1,49 +1,210 @@
-from typing import Literal
+import functools
+import os
+from typing import Callable, Iterator, Literal, Sequence
 
+import numpy as np
 import sympy as sp
 from qiskit import QuantumCircuit
+from qiskit.circuit import Parameter
 
-from .build import circuit_to_chunks
-from .base import MeasurementChunk, MeasurementBranch, BarrierLayer
+from .build import decompose_circuit, decomposed_circuit_to_chunks
+from .base import Chunk, MeasurementChunk, ResetChunk, MeasurementBranch, BarrierLayer, ChunkedCircuit, ClbitKey
 from .measurement_circuit import MeasurementCircuitBackend
+from .density_circuit import DensityCircuitBackend
 from .unitary_circuit import UnitaryCircuitBackend
+from .numeric import parameter_symbols, lambdify_batched, binding_matrix
+from .simplify import SimplifyOptions, SimplifyStrategy
+from .checkpoint import CheckpointPolicy
+from .disk_cache import DiskCache, circuit_cache_key
+from .shared import SharedState
+from ..gate import gate_matrix_cache_info
+from ..gate.cache import CacheInfo
+from ..gate.utils import parse_param
+
+def _persist(method):
+    # write newly memoized symbolic results to the disk cache after a public query
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self._sync_cache()
+    return wrapper
 
 class CircuitInspector:
-    def __init__(self, qc: QuantumCircuit, simplify_on_build: bool = False):
-        chunked_circuit = circuit_to_chunks(qc)
+    def __init__(self,
+        qc: QuantumCircuit,
+        simplify_on_build: bool = False,
+        workers: int | None = None,
+        simplify_strategy: SimplifyStrategy = "simplify",
+        simplify_timeout: float | None = None,
+        cache_dir: str | os.PathLike | None = None,
+        cache_max_bytes: int | None = None,
+        shared_subexpressions: bool = False,
+        mode: Literal["auto", "density"] = "auto",
+        condition_on_clbits: bool = False,
+        checkpoint_every: int | None = None,
+        snapshot_cache_size: int = 8,
+        fusion_width: int | None = None,
+        arithmetic: Literal["sympy", "domain", "half_angle"] = "sympy",
+    ):
+        """
+        Args:
+            qc (QuantumCircuit): circuit to inspect
+            simplify_on_build (bool): If True, every computed state or branch list is simplified before caching.
+            workers (int | None): If > 1, simplification runs over a process pool of this size,
+                for `simplify_on_build`, `simplify()` and queries with `simplify=True`.
+                In measurement mode, independent branches are also evolved and split over the pool.
+            simplify_strategy (str | Callable): Default simplification used when `simplify=True`:
+                - "simplify": sympy.simplify (slowest, most thorough)
+                - "trigsimp": sympy.trigsimp
+                - "cancel": sympy.cancel
+                - "expand_complex": sympy.expand_complex
+                - "half_angle": polynomial in cos(θ/2), sin(θ/2) of each parameter θ
+                - a callable sympy.Expr -> sympy.Expr (picklable if `workers` > 1)
+            simplify_timeout (float | None): Per-expression wall-clock budget in seconds,
+                an expression exceeding it is kept unsimplified. Enforced on POSIX systems only.
+            cache_dir (str | PathLike | None): If given, chunked structure, computed states/branches,
+                chunk matrices and simplified results are persisted in this directory, keyed by a hash
+                of the decomposed circuit, global phase and simplification options.
+                An identical circuit inspected later reuses them without redoing the symbolic work.
+            cache_max_bytes (int | None): Size bound of `cache_dir`, least recently used entries are evicted.
+            shared_subexpressions (bool): If True, states and branches are stored as a shared CSE DAG
+                (a table of common subexpressions plus amplitudes referencing it) instead of independent
+                expression trees. Queries still return plain expressions, `shared_state()` returns the
+                DAG itself, and `compile()`/`sweep()` evaluate each shared subexpression once.
+            mode (str):
+                - "auto": "unitary" (statevector) if the circuit has no measurement, "measurement" (branches) otherwise
+                - "density": evolve a density matrix, measurements are projective channels and `reset` is supported.
+                    The cost does not grow with the number of measurements, query with `density_matrix()`.
+            condition_on_clbits (bool): Only used by "density" mode. If True, keep one unnormalized density matrix
+                per classical record, see `conditional_density_matrices()`. Otherwise measurements only dephase.
+            checkpoint_every (int | None): If given, only the state at every `checkpoint_every`-th labelled barrier
+                (plus the initial and final state) is kept as a checkpoint, other barriers are recomputed on demand
+                from the nearest earlier checkpoint. None keeps every computed state.
+            snapshot_cache_size (int): Number of recently queried non-checkpoint states kept in an LRU,
+                only used with `checkpoint_every`.
+            fusion_width (int | None): If given, runs of consecutive gates acting on at most this many qubits
+                (e.g. ry·rz·ry on one qubit, or gates on the same pair) are multiplied once into a small
+                (2^k x 2^k) gate before layering, so fewer gates are applied to states and fewer full-size
+                layer matrices are built. Barriers, measurements and resets are never crossed.
+            arithmetic (str): Arithmetic of chunk products and state evolution:
+                - "sympy": generic sympy expressions. Parameter-free chunks on parameter-free inputs still
+                    run in an exact algebraic domain.
+                - "domain": polynomials over QQ<I, radicals> in the trigonometric atoms of the parameters
+                    (cos(θ/2), sin(θ/2), ...). Products are expanded and canonical, so cancellations happen
+                    during the evolution, but expanded polynomials can grow large on deep circuits.
+                    Falls back to "sympy" where no such ring fits (e.g. non-dyadic float parameters).
+                - "half_angle": polynomials in c = cos(θ/2), s = sin(θ/2) of each parameter θ, kept reduced
+                    modulo c² + s² - 1 after every gate so that equal amplitudes have a single representation.
+                    Converted back to trigonometric form only on output. Falls back to "sympy" where some
+                    angle is not a multiple of a half parameter (e.g. θ/4).
+        """
+        if mode not in ("auto", "density"):
+            raise ValueError(f"Invalid mode: '{mode}'. Must be 'auto' or 'density'.")
+        if arithmetic not in ("sympy", "domain", "half_angle"):
+            raise ValueError(f"Invalid arithmetic: '{arithmetic}'. Must be 'sympy', 'domain' or 'half_angle'.")
+        simplify_options = SimplifyOptions(simplify_strategy, simplify_timeout, workers)
+        checkpoint_policy = CheckpointPolicy(checkpoint_every, snapshot_cache_size)
+        decomposed = decompose_circuit(qc)
+        self._circuit = qc
+        self._decomposed = decomposed
+        self._fusion_width = fusion_width
+        self.parameters = list(qc.parameters)
+
+        self._disk_cache = None
+        payload = None
+        if cache_dir is not None:
+            self._disk_cache = DiskCache(cache_dir, cache_max_bytes)
+            self._cache_options = (simplify_on_build, simplify_options, {
+                'shared_subexpressions': shared_subexpressions,
+                'mode': mode,
+                'condition_on_clbits': condition_on_clbits,
+                'fusion_width': fusion_width,
+                'arithmetic': arithmetic,
+            })
+            self._cache_key = self._compute_cache_key()
+            payload = self._disk_cache.load(self._cache_key)
+
+        if payload is None:
+            chunked_circuit = decomposed_circuit_to_chunks(decomposed, fusion_width)
+        else:
+            chunked_circuit = ChunkedCircuit(payload['chunks'], parse_param(decomposed.global_phase))
         chunks = chunked_circuit.chunks
         globel_phase = chunked_circuit.global_phase
-        
+
         self.has_measurement = any(isinstance(c, MeasurementChunk) for c in chunks)
-        self.mode: Literal["unitary", "measurement"] = (
-            "measurement" if self.has_measurement else "unitary"
+        self.mode: Literal["unitary", "measurement", "density"] = (
+            "density" if mode == "density" else "measurement" if self.has_measurement else "unitary"
         )
+        self._check_chunks(chunks)
 
-        if self.mode == "unitary":
-            self.backend = UnitaryCircuitBackend(chunks, qc.num_qubits, simplify_on_build, globel_phase)
+        if self.mode == "density":
+            self.backend = DensityCircuitBackend(
+                chunks, qc.num_qubits, simplify_on_build, globel_phase, simplify_options, shared_subexpressions,
+                checkpoint_policy, condition_on_clbits, arithmetic,
+            )
+        elif self.mode == "unitary":
+            self.backend = UnitaryCircuitBackend(
+                chunks, qc.num_qubits, simplify_on_build, globel_phase, simplify_options, shared_subexpressions,
+                checkpoint_policy, arithmetic,
+            )
         else:
-            self.backend = MeasurementCircuitBackend(chunks, qc.num_qubits, simplify_on_build, globel_phase)
+            self.backend = MeasurementCircuitBackend(
+                chunks, qc.num_qubits, simplify_on_build, globel_phase, simplify_options, shared_subexpressions,
+                checkpoint_policy, arithmetic,
+            )
+
+        if payload is not None:
+            self.backend.import_cache(payload)
+        self._saved_cache_state = self.backend.cache_state if payload is not None else None
+
+    def _check_chunks(self, chunks: list[Chunk | BarrierLayer]) -> None:
+        if self.mode != "density" and any(isinstance(c, ResetChunk) for c in chunks):
+            raise ValueError("Circuit contains `reset`, which is only supported with mode='density'.")
+
+    def _compute_cache_key(self) -> str:
+        simplify_on_build, simplify_options, backend_options = self._cache_options
+        return circuit_cache_key(self._decomposed, simplify_on_build, simplify_options, backend_options)
+
+    def _sync_cache(self) -> None:
+        if self._disk_cache is None or self.backend.cache_state == self._saved_cache_state:
+            return
+        self._disk_cache.save(self._cache_key, self.backend.export_cache())
+        self._saved_cache_state = self.backend.cache_state
     
+    def _check_mode(self, query: Literal["statevector", "branches", "density_matrix"]) -> None:
+        if query == "statevector" and self.mode == "measurement":
+            raise RuntimeError("Cannot query `statevector()` on a circuit with measurement — use `branches()` instead.")
+        if query == "branches" and self.mode == "unitary":
+            raise RuntimeError("Circuit has no measurements — use `statevector()` instead.")
+        if query in ("statevector", "branches") and self.mode == "density":
+            raise RuntimeError(f"Cannot query `{query}()` in density mode — use `density_matrix()` instead.")
+        if query == "density_matrix" and self.mode != "density":
+            raise RuntimeError("Density matrices are only available with mode='density'.")
+
     def __repr__(self):
         return f"<CircuitInspector mode={self.mode}, num_qubits={self.backend.num_qubits}, barrier_labels={self.backend.barrier_labels}, chunks={self.backend.chunks}>"
 
-    def statevector(self, label: str|None = None, simplify: bool = False) -> sp.Matrix:
+    @_persist
+    def statevector(self, label: str|None = None, simplify: bool | SimplifyStrategy = False) -> sp.Matrix:
         """
         Returns the symbolic statevector at the given barrier label.
 
         Args:
             label (str | None): Barrier label to query.
                 If None, return the final statevector of the circuit
-            simplify (bool): If True, simplify the result before returning.
+            simplify (bool | str | Callable): If True, simplify the result with the default strategy before returning.
+                A strategy name or callable selects another strategy (see `CircuitInspector`).
 
         Returns:
             sympy.Matrix: Statevector at the specified barrier.
         """
-        if self.mode != "unitary":
-            raise RuntimeError("Cannot query `statevector()` on a circuit with measurement — use `branches()` instead.")
+        self._check_mode("statevector")
         return self.backend.statevector(label, simplify)
 
-    def branches(self, label: str|None = None, simplify: bool = False) -> list[MeasurementBranch]:
+    @_persist
+    def branches(self, label: str|None = None, simplify: bool | SimplifyStrategy = False) -> list[MeasurementBranch]:
         """
         Returns the measurement branches (list[MeasurementBranch]) at the given barrier label.
 
@@ -56,16 +217,78 @@ class CircuitInspector:
         Args:
             label (str | None): Barrier label to query.
                 If None, return the final branches of the circuit
-            simplify (bool): If True, simplify each branch before returning.
+            simplify (bool | str | Callable): If True, simplify each branch with the default strategy before returning.
+                A strategy name or callable selects another strategy (see `CircuitInspector`).
 
         Returns:
             list[MeasurementBranch]: branches at the specified barrier.
         """
-        if self.mode != "measurement":
-            raise RuntimeError("Circuit has no measurements — use `statevector()` instead.")
+        self._check_mode("branches")
         return self.backend.branches(label, simplify)
     
-    def probabilities(self, label: str|None = None, simplify: bool = False) -> sp.Matrix:
+    @_persist
+    def density_matrix(self, label: str|None = None, simplify: bool | SimplifyStrategy = False) -> sp.Matrix:
+        """
+        Returns the symbolic density matrix at the given barrier label, averaged over measurement outcomes.
+        Only available with mode="density".
+
+        Args:
+            label (str | None): Barrier label to query.
+                If None, return the final density matrix of the circuit
+            simplify (bool | str | Callable): If True, simplify the result with the default strategy before returning.
+                A strategy name or callable selects another strategy (see `CircuitInspector`).
+
+        Returns:
+            sympy.Matrix: (2^n, 2^n) density matrix at the specified barrier.
+        """
+        self._check_mode("density_matrix")
+        return self.backend.density_matrix(label, simplify)
+
+    @_persist
+    def conditional_density_matrices(
+        self, label: str|None = None, simplify: bool | SimplifyStrategy = False
+    ) -> dict[ClbitKey, sp.Matrix]:
+        """
+        Returns the unnormalized density matrix of each classical record at the given barrier label.
+        Only available with mode="density".
+
+        Args:
+            label (str | None): Barrier label to query.
+                If None, return the final density matrices of the circuit
+            simplify (bool | str | Callable): If True, simplify the result with the default strategy before returning.
+                A strategy name or callable selects another strategy (see `CircuitInspector`).
+
+        Returns:
+            dict[ClbitKey, sympy.Matrix]: sorted ((clbit_idx, measured value), ...) -> density matrix,
+                whose trace is the probability of that record. With `condition_on_clbits=False`,
+                the only key is () and its value is `density_matrix(label)`.
+        """
+        self._check_mode("density_matrix")
+        return self.backend.conditional_density_matrices(label, simplify)
+
+    @_persist
+    def shared_state(self, label: str|None = None, simplify: bool | SimplifyStrategy = False) -> SharedState:
+        """
+        Returns the statevector (unitary mode), branches (measurement mode) or conditional density matrices
+        (density mode) at the given barrier label as a shared CSE DAG, without expanding it.
+
+        With `shared_subexpressions=False`, the subexpression table is empty and the state is plain.
+
+        Args:
+            label (str | None): Barrier label to query.
+                If None, return the final state of the circuit
+            simplify (bool | str | Callable): If True, simplify with the default strategy before returning.
+                A strategy name or callable selects another strategy (see `CircuitInspector`).
+
+        Returns:
+            SharedState: `subexpressions` (symbol, definition) pairs in evaluation order and the reduced `state`,
+                `SharedState.expand()` gives the same result as `statevector()` / `branches()` /
+                `conditional_density_matrices()`.
+        """
+        return self.backend.shared_state(label, simplify)
+
+    @_persist
+    def probabilities(self, label: str|None = None, simplify: bool | SimplifyStrategy = False) -> sp.Matrix:
         """
         Return symbolic measurement probabilities as a column vector.
 
@@ -77,16 +300,20 @@ class CircuitInspector:
         - In **measurement mode**, output Matrix index refers to **measurement order** in circuit:
             [first measured qubit, ..., last measured qubit]
 
+        - In **density mode**, output Matrix is the diagonal of `density_matrix(label)`, in **qubit order**.
+
         Args:
             label (str | None): Barrier label to query. If None, returns final output.
-            simplify (bool):  If True, simplify before returning.
+            simplify (bool | str | Callable):  If True, simplify with the default strategy before returning.
+                A strategy name or callable selects another strategy (see `CircuitInspector`).
 
         Returns:
             sp.Matrix: (2^n, 1) column vector of symbolic probabilities.
         """
         return self.backend.probabilities(label, simplify)
     
-    def unitary(self, label_start: str = None, label_end: str = None, simplify: bool = False) -> sp.Matrix:
+    @_persist
+    def unitary(self, label_start: str = None, label_end: str = None, simplify: bool | SimplifyStrategy = False) -> sp.Matrix:
         """
         Compute the symbolic unitary matrix between two barrier labels.
 
@@ -95,7 +322,8 @@ class CircuitInspector:
                 If None, the unitary is computed from the beginning of the circuit.
             label_end (str | None): The label of the ending barrier.
                 If None, the unitary is computed up to the end of the circuit.
-            simplify (bool): If True, return simplified unitary matrix.
+            simplify (bool | str | Callable): If True, return unitary matrix simplified with the default strategy.
+                A strategy name or callable selects another strategy (see `CircuitInspector`).
 
         Returns:
             sympy.Matrix: The composed unitary matrix from `label_start` to `label_end`.
@@ -110,7 +338,194 @@ class CircuitInspector:
         """
         return self.backend.unitary(label_start, label_end, simplify)
     
-    def simplify(self) -> None:
+    @_persist
+    def precompute(self) -> None:
+        """
+        Eagerly computes the statevector/branches at every barrier and the final output,
+        as well as the chunk matrices used by `unitary()`.
+
+        By default these are computed lazily on first query and memoized.
+        """
+        return self.backend.precompute()
+
+    def cache_info(self) -> dict[str, CacheInfo]:
+        """
+        Hit/miss statistics of the symbolic caches:
+            - "chunk_templates": chunk matrices of this inspector, keyed by the chunk structure with
+                parameters renamed, a hit builds the matrix of a repeated block from its template
+            - "gate_matrices": gate matrices keyed by (gate name, parameters), shared by all inspectors
+        """
+        return {
+            'chunk_templates': self.backend.chunk_templates.info(),
+            'gate_matrices': gate_matrix_cache_info(),
+        }
+
+    @_persist
+    def extend(self, qc_suffix: QuantumCircuit) -> None:
+        """
+        Append a circuit segment in-place, without re-evolving the circuit inspected so far.
+
+        Only the new instructions are decomposed and chunked. Cached states, branches and chunk matrices
+        are kept, so evolving to the new final output starts from the previous final output.
+
+        Args:
+            qc_suffix (QuantumCircuit): segment to append, its qubits and clbits are mapped to the first
+                qubits and clbits of the inspected circuit (same as `QuantumCircuit.compose`).
+
+        Raises:
+            ValueError: If the segment is wider than the circuit, adds a barrier label that already exists,
+                adds measurements to a unitary-mode inspector, or adds `reset` outside density mode.
+        """
+        if qc_suffix.num_qubits > self._circuit.num_qubits or qc_suffix.num_clbits > self._circuit.num_clbits:
+            raise ValueError(
+                f"Cannot extend a circuit with {self._circuit.num_qubits} qubits and {self._circuit.num_clbits} clbits "
+                f"by a segment with {qc_suffix.num_qubits} qubits and {qc_suffix.num_clbits} clbits."
+            )
+        circuit = self._circuit.compose(qc_suffix)
+        decomposed_suffix = decompose_circuit(qc_suffix)
+        chunked_suffix = decomposed_circuit_to_chunks(decomposed_suffix, self._fusion_width)
+
+        if self.mode == "unitary" and any(isinstance(c, MeasurementChunk) for c in chunked_suffix.chunks):
+            raise ValueError(
+                "Cannot extend a unitary-mode inspector with measurements — inspect the full circuit instead."
+            )
+        self._check_chunks(chunked_suffix.chunks)
+        self.backend.extend(chunked_suffix.chunks, chunked_suffix.global_phase)
+
+        self._circuit = circuit
+        self._decomposed = self._decomposed.compose(decomposed_suffix)
+        self.parameters = list(circuit.parameters)
+        if self._disk_cache is not None:
+            self._cache_key = self._compute_cache_key()
+            self._saved_cache_state = None
+
+    @_persist
+    def compile(self,
+        target: Literal["statevector", "probabilities", "unitary"] = "statevector",
+        label: str | None = None,
+        label_start: str | None = None,
+    ) -> Callable[[np.ndarray], np.ndarray]:
+        """
+        Compile a symbolic result into a batched NumPy function.
+
+        The symbolic result is built once, then lambdified with common subexpression elimination,
+        so evaluating it at many parameter points avoids `.subs(...).evalf()` per point.
+
+        Args:
+            target (str):
+                - "statevector": `statevector(label)`, unitary mode only
+                - "probabilities": `probabilities(label)`
+                - "unitary": `unitary(label_start, label)`
+            label (str | None): Barrier label to query (end label for "unitary").
+                If None, use the final output.
+            label_start (str | None): Start label, only used by "unitary".
+
+        Returns:
+            Callable: maps parameter values of shape (batch, n_params), ordered as `qc.parameters`,
+                to a complex128 array of shape (batch, 2^n) for vectors or (batch, 2^n, 2^n) for "unitary".
+                A 1-D input (n_params,) evaluates a single point and drops the batch axis.
+        """
+        if target in ("statevector", "probabilities"):
+            exprs = self._reduced_exprs(target, label)
+            shape = (len(exprs),)
+        elif target == "unitary":
+            expr = self.unitary(label_start, label)
+            exprs, shape = list(expr), expr.shape
+        else:
+            raise ValueError(f"Invalid target: '{target}'. Must be 'statevector', 'probabilities' or 'unitary'.")
+
+        evaluate = lambdify_batched(exprs, parameter_symbols(self.parameters), self._subexpressions_of(exprs))
+
+        def compiled(values: np.ndarray) -> np.ndarray:
+            out = evaluate(values)
+            return out.reshape(out.shape[:-1] + shape)
+
+        return compiled
+
+    @_persist
+    def sweep(self,
+        bindings: dict[Parameter, np.ndarray] | np.ndarray,
+        outputs: Sequence[Literal["statevector", "probabilities", "branch_probabilities", "density_matrix"]] = ("probabilities",),
+        labels: Sequence[str | None] = (None,),
+        chunk_size: int | None = None,
+    ) -> dict[tuple[str, str | None], np.ndarray]:
+        """
+        Evaluate several symbolic results over a batch of parameter points in one vectorized pass.
+
+        All requested outputs at all requested labels are compiled into a single NumPy function,
+        so subexpressions shared across barriers and branches are evaluated once per point.
+
+        Args:
+            bindings: dict of Parameter -> 1-D values (batch), covering every circuit parameter,
+                or an array (batch, n_params) with columns ordered as `qc.parameters`.
+            outputs (Sequence[str]):
+                - "statevector": statevector, unitary mode only
+                - "probabilities": same as `probabilities(label)`
+                - "branch_probabilities": probability of each branch in `branches(label)`, measurement mode only
+                - "density_matrix": row-major entries of `density_matrix(label)`, density mode only
+            labels (Sequence[str | None]): Barrier labels to evaluate, None for the final output.
+            chunk_size (int | None): If given, evaluate at most `chunk_size` points at a time.
+
+        Returns:
+            dict[(output, label), np.ndarray]: complex128 array of shape (batch, m) for each output and label.
+        """
+        results = list(self.iter_sweep(bindings, outputs, labels, chunk_size))
+        if not results:
+            return {}
+        return {key: np.concatenate([r[key] for r in results]) for key in results[0]}
+
+    def iter_sweep(self,
+        bindings: dict[Parameter, np.ndarray] | np.ndarray,
+        outputs: Sequence[Literal["statevector", "probabilities", "branch_probabilities", "density_matrix"]] = ("probabilities",),
+        labels: Sequence[str | None] = (None,),
+        chunk_size: int | None = None,
+    ) -> Iterator[dict[tuple[str, str | None], np.ndarray]]:
+        """
+        Same as `sweep()`, but yields the results chunk by chunk (at most `chunk_size` points each),
+        so large parameter grids never have to be held in memory at once.
+        """
+        values = binding_matrix(bindings, self.parameters)
+
+        keys: list[tuple[str, str | None]] = []
+        exprs: list[sp.Expr] = []
+        slices: list[slice] = []
+        for label in labels:
+            for output in outputs:
+                block = self._reduced_exprs(output, label)
+                keys.append((output, label))
+                slices.append(slice(len(exprs), len(exprs) + len(block)))
+                exprs.extend(block)
+
+        evaluate = lambdify_batched(exprs, parameter_symbols(self.parameters), self._subexpressions_of(exprs))
+        step = chunk_size or max(len(values), 1)
+        for start in range(0, len(values), step):
+            out = evaluate(values[start:start + step])
+            yield {key: out[:, s] for key, s in zip(keys, slices)}
+
+    def _reduced_exprs(self, output: str, label: str | None) -> list[sp.Expr]:
+        # unexpanded expressions, written in terms of the shared subexpression table if there is one
+        if output == "statevector":
+            self._check_mode("statevector")
+            return list(self.backend.statevector(label, False, expand=False))
+        if output == "probabilities":
+            return list(self.backend.probabilities(label, False, expand=False))
+        if output == "branch_probabilities":
+            self._check_mode("branches")
+            return [b.prob for b in self.backend.branches(label, False, expand=False)]
+        if output == "density_matrix":
+            self._check_mode("density_matrix")
+            return list(self.backend.density_matrix(label, False, expand=False))
+        raise ValueError(
+            f"Invalid output: '{output}'. Must be 'statevector', 'probabilities', 'branch_probabilities' or 'density_matrix'."
+        )
+
+    def _subexpressions_of(self, exprs: list[sp.Expr]) -> list[tuple[sp.Symbol, sp.Expr]] | None:
+        if self.backend.subexpressions is None:
+            return None
+        return self.backend.subexpressions.dependencies(exprs)
+
+    @_persist
+    def simplify(self, workers: int | None = None, strategy: SimplifyStrategy | None = None) -> None:
         """
         Simplifies all symbolic states or branches in-place.
 
@@ -118,12 +533,19 @@ class CircuitInspector:
         For measurement circuits, this simplifies all measurement branches.
 
         Caches results to avoid repeated simplification.
+
+        Args:
+            workers (int | None): If > 1, simplify independent amplitudes and branch probabilities
+                over a process pool of this size. Defaults to the inspector's `workers`.
+            strategy (str | Callable | None): Simplification strategy (see `CircuitInspector`).
+                Defaults to the inspector's `simplify_strategy`.
         """
-        return self.backend.simplify()
+        return self.backend.simplify(strategy, workers)
     
+    @_persist
     def report(self,
         label: Literal["*", None] | str = '*',
-        simplify: bool = False,
+        simplify: bool | SimplifyStrategy = False,
         output: Literal["auto", "terminal", "notebook"] = 'auto',
         notation: Literal["dirac", "column"] = "column",
     ) -> None:
@@ -136,8 +558,8 @@ class CircuitInspector:
                 - "*" to report all barrier states and the final state.
                 - None to report only the final statevector.
 
-            simplify (bool):
-                Whether to simplify symbolic expressions before displaying them.
+            simplify (bool | str | Callable):
+                Whether to simplify symbolic expressions before displaying them, optionally with a given strategy.
 
             output (str):
                 - "auto": detect notebook or terminal automatically
@@ -0,0 +1,130 @@
+from typing import Literal
+
+import sympy as sp
+
+from .base import Arithmetic, Chunk, BarrierLayer, StandardGateChunk, MeasurementChunk, ResetChunk, ClbitKey
+from .circuit_backend import CircuitBackend
+from .checkpoint import CheckpointPolicy
+from .simplify import SimplifyOptions, SimplifyStrategy, simplify_exprs, simplify_matrix
+from .utils import _use_notebook, _display_expr
+
+class DensityCircuitBackend(CircuitBackend):
+    """
+    Evolves unnormalized density matrices keyed by classical record, rho -> U rho U^†.
+
+    Measurements are projective channels and resets are supported. Without `condition_on_clbits`,
+    a single averaged density matrix is kept, so the cost is independent of the number of measurements.
+    """
+
+    def __init__(
+        self,
+        chunks: list[Chunk | BarrierLayer],
+        num_qubits: int,
+        simplify_on_build: bool,
+        global_phase: float|sp.Expr,
+        simplify_options: SimplifyOptions | None = None,
+        shared_subexpressions: bool = False,
+        checkpoint_policy: CheckpointPolicy | None = None,
+        condition_on_clbits: bool = False,
+        arithmetic: Arithmetic = "sympy",
+    ):
+        self.condition_on_clbits = condition_on_clbits
+        super().__init__(
+            chunks, num_qubits, simplify_on_build, global_phase, simplify_options, shared_subexpressions, checkpoint_policy,
+            arithmetic,
+        )
+
+    def _initial_state(self) -> dict[ClbitKey, sp.Matrix]:
+        # the global phase cancels in rho
+        rho = sp.zeros(2 ** self.num_qubits, 2 ** self.num_qubits)
+        rho[0, 0] = 1
+        return {(): rho}
+
+    def _apply_chunk(self, chunk: Chunk | BarrierLayer, states: dict[ClbitKey, sp.Matrix]) -> dict[ClbitKey, sp.Matrix]:
+        dim = 2 ** self.num_qubits
+        if isinstance(chunk, MeasurementChunk):
+            entries = {key: list(rho) for key, rho in states.items()}
+            entries = chunk.apply_to_density(entries, self.num_qubits, self.condition_on_clbits)
+            return {key: sp.Matrix(dim, dim, e) for key, e in entries.items()}
+        if isinstance(chunk, StandardGateChunk):
+            return {
+                key: sp.Matrix(dim, dim, chunk.apply_to_density(list(rho), self.num_qubits, self.arithmetic))
+                for key, rho in states.items()
+            }
+        if isinstance(chunk, ResetChunk):
+            return {
+                key: sp.Matrix(dim, dim, chunk.apply_to_density(list(rho), self.num_qubits))
+                for key, rho in states.items()
+            }
+        return states
+
+    def _apply_phase(self, states: dict[ClbitKey, sp.Matrix], factor: sp.Expr) -> dict[ClbitKey, sp.Matrix]:
+        # a global phase cancels in rho
+        return states
+
+    def _simplify_state(self, states: dict[ClbitKey, sp.Matrix], options: SimplifyOptions) -> dict[ClbitKey, sp.Matrix]:
+        # only nonzero entries are simplified, zeros stay in place
+        exprs = self._state_exprs(states)
+        nonzero = [i for i, e in enumerate(exprs) if e != 0]
+        for i, e in zip(nonzero, simplify_exprs([exprs[i] for i in nonzero], options)):
+            exprs[i] = e
+        return self._rebuild_state(states, exprs)
+
+    def _state_exprs(self, states: dict[ClbitKey, sp.Matrix]) -> list[sp.Expr]:
+        return [e for rho in states.values() for e in rho]
+
+    def _rebuild_state(self, states: dict[ClbitKey, sp.Matrix], exprs: list[sp.Expr]) -> dict[ClbitKey, sp.Matrix]:
+        dim = 2 ** self.num_qubits
+        size = dim * dim
+        return {
+            key: sp.Matrix(dim, dim, exprs[i * size:(i + 1) * size])
+            for i, key in enumerate(states)
+        }
+
+    def conditional_density_matrices(
+        self, label: str|None, simplify: bool | SimplifyStrategy, expand: bool = True
+    ) -> dict[ClbitKey, sp.Matrix]:
+        return dict(self._query(label, simplify, expand))
+
+    def density_matrix(self, label: str|None, simplify: bool | SimplifyStrategy, expand: bool = True) -> sp.Matrix:
+        states = self.conditional_density_matrices(label, simplify, expand)
+        if len(states) == 1:
+            return next(iter(states.values()))
+        rho = sp.Matrix.zeros(2 ** self.num_qubits, 2 ** self.num_qubits)
+        for state in states.values():
+            rho += state
+        options = self._resolve_simplify(simplify)
+        if options:
+            rho = simplify_matrix(rho, options)
+        return rho
+
+    def probabilities(self, label: str|None, simplify: bool | SimplifyStrategy, expand: bool = True) -> sp.Matrix:
+        rho = self.density_matrix(label, simplify, expand)
+        return rho.diagonal().T
+
+    def report(self,
+        label: Literal["*", None] | str,
+        simplify: bool | SimplifyStrategy,
+        output: Literal["auto", "terminal", "notebook"],
+        notation: Literal["dirac", "column"],
+    ) -> None:
+        if notation != "column":
+            raise ValueError(f"Invalid notation: '{notation}'. Density matrices only support 'column'.")
+        use_nb = _use_notebook(output)
+        if label == "*":
+            for label in [None] + self.barrier_labels:
+                self._report_density(label, simplify, use_nb)
+        else:
+            self._report_density(label, simplify, use_nb)
+
+    def _report_density(self, label: str|None, simplify: bool | SimplifyStrategy, use_nb: bool):
+        if label is None:
+            print('- Final density matrix:')
+        else:
+            print(f'- Density matrix at {label}:')
+        if not self.condition_on_clbits:
+            _display_expr(self.density_matrix(label, simplify), use_nb, False, self.num_qubits)
+            return
+        for key, rho in self.conditional_density_matrices(label, simplify).items():
+            print(f'  * Classical bits results (clbit index: measured value): {dict(key)}')
+            _display_expr(rho, use_nb, False, self.num_qubits)
@@ -0,0 +1,97 @@
+import hashlib
+import os
+import pickle
+import zlib
+from pathlib import Path
+
+import sympy as sp
+from .build import FlatCircuit
+from .simplify import SimplifyOptions
+from ..gate import gate_param_key
+from ..gate.utils import parse_param
+
+CACHE_FORMAT_VERSION = 3
+
+def _canonical_instructions(decomposed: FlatCircuit) -> list:
+    return [
+        (
+            op.name,
+            qubits,
+            clbits,
+            tuple(gate_param_key(p) for p in op.params) if op.name != 'delay' else (),
+            getattr(op, 'label', None) if op.name == 'barrier' else None,
+        )
+        for op, qubits, clbits in decomposed.instructions
+    ]
+
+def _strategy_name(strategy) -> str:
+    if callable(strategy):
+        return f"{strategy.__module__}.{getattr(strategy, '__qualname__', repr(strategy))}"
+    return strategy
+
+def circuit_cache_key(
+    decomposed: FlatCircuit,
+    simplify_on_build: bool,
+    simplify_options: SimplifyOptions,
+    backend_options: dict | None = None,
+) -> str:
+    """sha256 of the decomposed circuit, global phase, simplification options and backend options."""
+    canonical = (
+        CACHE_FORMAT_VERSION,
+        decomposed.num_qubits,
+        decomposed.num_clbits,
+        _canonical_instructions(decomposed),
+        sp.srepr(parse_param(decomposed.global_phase)),
+        simplify_on_build,
+        _strategy_name(simplify_options.strategy),
+        simplify_options.timeout,
+        sorted((backend_options or {}).items()),
+    )
+    return hashlib.sha256(repr(canonical).encode()).hexdigest()
+
+class DiskCache:
+    """
+    Directory of zlib-compressed pickles, one per circuit key.
+
+    When the directory grows beyond `max_bytes`, the least recently used entries are evicted.
+    """
+
+    suffix = '.pkl.z'
+
+    def __init__(self, cache_dir: str | os.PathLike, max_bytes: int | None = None):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{self.suffix}"
+
+    def load(self, key: str) -> dict | None:
+        path = self._path(key)
+        try:
+            payload = pickle.loads(zlib.decompress(path.read_bytes()))
+        except (OSError, zlib.error, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return None
+        path.touch() # mark as recently used
+        return payload
+
+    def save(self, key: str, payload: dict) -> None:
+        data = zlib.compress(pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL))
+        path = self._path(key)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        self._evict(keep=path)
+
+    def _evict(self, keep: Path) -> None:
+        if self.max_bytes is None:
+            return
+        entries = sorted(self.cache_dir.glob(f"*{self.suffix}"), key=lambda p: p.stat().st_mtime)
+        total = sum(p.stat().st_size for p in entries)
+        for path in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            total -= path.stat().st_size
+            path.unlink(missing_ok=True)
@@ -1,87 +1,111 @@
 from typing import Literal
 import sympy as sp
 
-from .base import Chunk, BarrierLayer, MeasurementBranch, StandardGateChunk, MeasurementChunk
+from .base import Arithmetic, Chunk, BarrierLayer, MeasurementBranch, StandardGateChunk, MeasurementChunk
 from .circuit_backend import CircuitBackend
+from .checkpoint import CheckpointPolicy
+from .simplify import SimplifyOptions, SimplifyStrategy, simplify_exprs
+from .parallel import parallel_map
 from .utils import _use_notebook, _display_expr
 
+def evolve_branches(
+    chunks: list[Chunk | BarrierLayer],
+    branches: list[MeasurementBranch],
+    num_qubits: int,
+    arithmetic: Arithmetic = "sympy"
+) -> list[MeasurementBranch]:
+    for chunk in chunks:
+        if isinstance(chunk, StandardGateChunk):
+            branches = [
+                MeasurementBranch(
+                    measured_bits=b.measured_bits,
+                    prob=b.prob,
+                    state=chunk.apply_to_state(b.state, num_qubits, arithmetic),
+                    clbit_results=b.clbit_results
+                )
+                for b in branches
+            ]
+        elif isinstance(chunk, MeasurementChunk):
+            branches = chunk.apply_measurement(branches)
+    return branches
+
+class _BranchEvolver:
+    """Picklable per-branch evolution through a run of chunks, returns the descendants of the branch."""
+
+    def __init__(self, chunks: list[Chunk | BarrierLayer], num_qubits: int, arithmetic: Arithmetic = "sympy"):
+        self.chunks = chunks
+        self.num_qubits = num_qubits
+        self.arithmetic = arithmetic
+
+    def __call__(self, branch: MeasurementBranch) -> list[MeasurementBranch]:
+        return evolve_branches(self.chunks, [branch], self.num_qubits, self.arithmetic)
+
 class MeasurementCircuitBackend(CircuitBackend):
     def __init__(
         self,
         chunks: list[Chunk | BarrierLayer],
         num_qubits: int,
         simplify_on_build: bool,
-        global_phase: float|sp.Expr
+        global_phase: float|sp.Expr,
+        simplify_options: SimplifyOptions | None = None,
+        shared_subexpressions: bool = False,
+        checkpoint_policy: CheckpointPolicy | None = None,
+        arithmetic: Arithmetic = "sympy",
     ):
-        super().__init__(chunks, num_qubits, simplify_on_build, global_phase)
-        self.branches_at_barrier: dict[str, list[MeasurementBranch]] = {}
-        self.branches_is_simplified: dict[str, bool] = {}
-        
-        self.final_branches = self.evolve()
-        self.final_branches_is_simplified: bool = simplify_on_build
-
-    def evolve(self) -> list[MeasurementBranch]:
+        super().__init__(
+            chunks, num_qubits, simplify_on_build, global_phase, simplify_options, shared_subexpressions, checkpoint_policy,
+            arithmetic,
+        )
+
+    def _initial_state(self) -> list[MeasurementBranch]:
         psi = sp.zeros(2 ** self.num_qubits, 1)
         psi[0] = sp.exp(sp.I * self.global_phase)
-        current_branches = [MeasurementBranch((), 1, psi, {})]
-
-        for chunk, U_chunk in zip(self.chunks, self.chunk_matrices):
-            
-            if isinstance(chunk, StandardGateChunk):
-                for i in range(len(current_branches)):
-                    b = current_branches[i]
-                    current_branches[i] = MeasurementBranch(
-                        measured_bits=b.measured_bits,
-                        prob=b.prob,
-                        state=U_chunk @ b.state,
-                        clbit_results=b.clbit_results
-                    )
-            elif isinstance(chunk, MeasurementChunk):
-                current_branches = chunk.apply_measurement(current_branches)
-            elif isinstance(chunk, BarrierLayer):
-                label = chunk.label
-                if label is not None:
-                    branches = (
-                        [b.simplify() for b in current_branches]
-                        if self.simplify_on_build else list(current_branches)
-                    )
-                    self.branches_at_barrier[label] = branches
-                    self.branches_is_simplified[label] = self.simplify_on_build
-        
-        if self.simplify_on_build:
-            current_branches = [b.simplify() for b in current_branches]
-            
-        return current_branches
-    
-    def _simplify_branches(self, label: str | None) -> list[MeasurementBranch]:
-        # if not simplified yet, simplify and cache result
-        # if simplified, return from cache
-        if label is None:
-            if not self.final_branches_is_simplified:
-                self.final_branches = [b.simplify() for b in self.final_branches]
-                self.final_branches_is_simplified = True
-            return self.final_branches
+        return [MeasurementBranch((), 1, psi, {})]
 
-        if not self.branches_is_simplified.get(label, False):
-            self.branches_at_barrier[label] = [b.simplify() for b in self.branches_at_barrier[label]]
-            self.branches_is_simplified[label] = True
+    def _apply_chunk(self, chunk: Chunk | BarrierLayer, branches: list[MeasurementBranch]) -> list[MeasurementBranch]:
+        return evolve_branches([chunk], branches, self.num_qubits, self.arithmetic)
 
-        return self.branches_at_barrier[label]
-    
-    def branches(self, label: str| None, simplify: bool) -> list[MeasurementBranch]:
-        if label is None:
-            return self._simplify_branches(None) if simplify else self.final_branches
-        
-        if label not in self.label_to_idx:
-            raise KeyError(f"Barrier label '{label}' not found. Available labels: {self.barrier_labels}")
+    def _apply_chunks(self, chunks: list[Chunk | BarrierLayer], branches: list[MeasurementBranch]) -> list[MeasurementBranch]:
+        # branches are independent: once there are several, each one is evolved through the remaining
+        # chunks in a worker, descendants are concatenated in branch order, same as the serial order
+        workers = self.simplify_options.workers
+        for i, chunk in enumerate(chunks):
+            if workers and workers > 1 and len(branches) > 1:
+                descendants = parallel_map(_BranchEvolver(chunks[i:], self.num_qubits, self.arithmetic), branches, workers)
+                return [b for group in descendants for b in group]
+            branches = self._apply_chunk(chunk, branches)
+        return branches
+
+    def _apply_phase(self, branches: list[MeasurementBranch], factor: sp.Expr) -> list[MeasurementBranch]:
+        return [
+            MeasurementBranch(b.measured_bits, b.prob, b.state * factor, b.clbit_results)
+            for b in branches
+        ]
+
+    def _simplify_state(self, branches: list[MeasurementBranch], options: SimplifyOptions) -> list[MeasurementBranch]:
+        # every branch probability and amplitude is simplified in one batch of independent expressions
+        return self._rebuild_state(branches, simplify_exprs(self._state_exprs(branches), options))
+
+    def _state_exprs(self, branches: list[MeasurementBranch]) -> list[sp.Expr]:
+        return [e for b in branches for e in [b.prob, *b.state]]
 
-        if label not in self.branches_at_barrier:
-            raise KeyError(f"No branches recorded at barrier '{label}'. ")
+    def _rebuild_state(self, branches: list[MeasurementBranch], exprs: list[sp.Expr]) -> list[MeasurementBranch]:
+        dim = 2 ** self.num_qubits
+        return [
+            MeasurementBranch(
+                measured_bits=b.measured_bits,
+                prob=exprs[i * (dim + 1)],
+                state=sp.Matrix(exprs[i * (dim + 1) + 1:(i + 1) * (dim + 1)]),
+                clbit_results=b.clbit_results,
+            )
+            for i, b in enumerate(branches)
+        ]
 
-        return self._simplify_branches(label) if simplify else self.branches_at_barrier[label]
+    def branches(self, label: str| None, simplify: bool | SimplifyStrategy, expand: bool = True) -> list[MeasurementBranch]:
+        return self._query(label, simplify, expand)
     
-    def probabilities(self, label: str|None, simplify: bool) -> sp.Matrix:
-        branches = self.branches(label, simplify)
+    def probabilities(self, label: str|None, simplify: bool | SimplifyStrategy, expand: bool = True) -> sp.Matrix:
+        branches = self.branches(label, simplify, expand)
         bit_prob_map: dict[tuple[int], sp.Expr] = {}
 
         for b in branches:
@@ -102,21 +126,21 @@ class MeasurementCircuitBackend(CircuitBackend):
         dim = 2 ** N
         probs = sp.zeros(dim, 1)
 
-        for bits, p in bit_prob_map.items():
+        values = list(bit_prob_map.values())
+        options = self._resolve_simplify(simplify)
+        if options:
+            values = simplify_exprs(values, options)
+
+        for bits, p in zip(bit_prob_map.keys(), values):
             bit_str = ''.join(str(bit) for bit in bits)
             index = int(bit_str, 2)
-            probs[index] = sp.simplify(p) if simplify else p
+            probs[index] = p
 
         return probs
     
-    def simplify(self) -> None:
-        for label in self.branches_at_barrier:
-            self._simplify_branches(label)
-        self._simplify_branches(None)
-    
     def report(self,
         label: Literal["*", None] | str,
-        simplify: bool,
+        simplify: bool | SimplifyStrategy,
         output: Literal["auto", "terminal", "notebook"],
         notation: Literal["dirac", "column"],
     ) -> None:
@@ -130,7 +154,7 @@ class MeasurementCircuitBackend(CircuitBackend):
         else:
             self._report_branches(label, simplify, use_nb, use_dirac)
     
-    def _report_branches(self, label: str|None, simplify: bool, use_nb: bool, use_dirac: bool):
+    def _report_branches(self, label: str|None, simplify: bool | SimplifyStrategy, use_nb: bool, use_dirac: bool):
         if label is None:
             print('- Final branches:')
         else:
@@ -0,0 +1,84 @@
+from typing import Callable
+
+import numpy as np
+import sympy as sp
+from qiskit.circuit import Parameter
+
+from ..gate.utils import parse_param
+
+def parameter_symbols(parameters: list[Parameter]) -> list[sp.Symbol]:
+    """Real sympy symbols matching qiskit parameters, in the same order."""
+    return [parse_param(p) for p in parameters]
+
+def lambdify_batched(
+    exprs: list[sp.Expr],
+    symbols: list[sp.Symbol],
+    subexpressions: list[tuple[sp.Symbol, sp.Expr]] | None = None,
+) -> Callable[[np.ndarray], np.ndarray]:
+    """
+    Compile expressions into a single CSE-optimized NumPy function.
+
+    Args:
+        exprs (list[sp.Expr]): expressions to evaluate (m)
+        symbols (list[sp.Symbol]): free symbols, in the order of the input columns (n_params)
+        subexpressions (list[tuple[sp.Symbol, sp.Expr]] | None): already extracted common subexpressions
+            that `exprs` are written in terms of, in evaluation order. They are evaluated once per call
+            and the remaining CSE only runs on the reduced expressions.
+
+    Returns:
+        Callable: maps parameter values (batch, n_params) to a complex128 array (batch, m).
+            A 1-D input (n_params,) is treated as a single point and returns (m,).
+    """
+    cse = True
+    if subexpressions:
+        def cse(reduced_exprs):
+            replacements, reduced = sp.cse(reduced_exprs, symbols=sp.numbered_symbols(cls=sp.Dummy))
+            return list(subexpressions) + replacements, reduced
+    func = sp.lambdify(symbols, exprs, modules="numpy", cse=cse)
+
+    def evaluate(values: np.ndarray) -> np.ndarray:
+        values = np.asarray(values, dtype=float)
+        single = values.ndim == 1
+        values = values.reshape(1, -1) if single else values
+        if values.ndim != 2 or values.shape[1] != len(symbols):
+            raise ValueError(
+                f"Expected parameter values of shape (batch, {len(symbols)}), got {values.shape}"
+            )
+
+        out = np.empty((values.shape[0], len(exprs)), dtype=np.complex128)
+        for j, column in enumerate(func(*values.T)):
+            out[:, j] = column # constants broadcast over the batch
+        return out[0] if single else out
+
+    return evaluate
+
+def binding_matrix(
+    bindings: dict[Parameter, np.ndarray] | np.ndarray,
+    parameters: list[Parameter],
+) -> np.ndarray:
+    """
+    Args:
+        bindings: either a dict of parameter -> 1-D values (batch), covering every parameter,
+            or an array (batch, n_params) with columns ordered as `parameters`.
+        parameters (list[Parameter]): circuit parameters, in `qc.parameters` order
+
+    Returns:
+        np.ndarray: parameter values (batch, n_params)
+    """
+    if isinstance(bindings, dict):
+        missing = [p for p in parameters if p not in bindings]
+        if missing:
+            raise ValueError(f"Missing bindings for parameters: {missing}")
+        columns = [np.asarray(bindings[p], dtype=float).ravel() for p in parameters]
+        if len({len(c) for c in columns}) > 1:
+            raise ValueError("All parameter value arrays must have the same length")
+        if not columns:
+            return np.empty((0, 0))
+        return np.stack(columns, axis=1)
+
+    values = np.asarray(bindings, dtype=float)
+    if values.ndim != 2 or values.shape[1] != len(parameters):
+        raise ValueError(
+            f"Expected parameter values of shape (batch, {len(parameters)}), got {values.shape}"
+        )
+    return values
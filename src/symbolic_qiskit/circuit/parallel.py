@@ -0,0 +1,19 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+def parallel_map(func: Callable[[T], R], items: Iterable[T], workers: int | None) -> list[R]:
+    """
+    Map `func` over `items`, over a process pool if `workers` > 1.
+
+    Results are returned in the order of `items`. `func` and the items must be picklable.
+    """
+    items = list(items)
+    if not workers or workers <= 1 or len(items) <= 1:
+        return [func(item) for item in items]
+
+    chunksize = max(1, len(items) // (4 * workers))
+    with ProcessPoolExecutor(max_workers=min(workers, len(items))) as pool:
+        return list(pool.map(func, items, chunksize=chunksize))
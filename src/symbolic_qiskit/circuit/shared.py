@@ -0,0 +1,76 @@
+from dataclasses import dataclass
+from typing import Iterable
+
+import sympy as sp
+
+class SubexpressionTable:
+    """
+    Shared table of common subexpressions, each bound to a dummy symbol.
+
+    Definitions may reference symbols defined before them, so the table is a DAG
+    in topological order and every repeated subtree is stored once.
+    """
+
+    def __init__(self):
+        self.definitions: dict[sp.Dummy, sp.Expr] = {}
+
+    def __len__(self) -> int:
+        return len(self.definitions)
+
+    def _new_symbols(self) -> Iterable[sp.Dummy]:
+        while True:
+            yield sp.Dummy(f"cse{len(self.definitions)}")
+
+    def compress(self, exprs: list[sp.Expr]) -> list[sp.Expr]:
+        """Extract the subexpressions of `exprs` into the table, returns the reduced expressions."""
+        replacements, reduced = sp.cse(exprs, symbols=self._new_symbols(), order='none')
+        for symbol, definition in replacements:
+            self.definitions[symbol] = definition
+        return reduced
+
+    def dependencies(self, exprs: list[sp.Expr]) -> list[tuple[sp.Dummy, sp.Expr]]:
+        """Table entries referenced by `exprs`, directly or through other entries, in table order."""
+        needed: set[sp.Dummy] = set()
+        pending = [s for e in exprs for s in sp.sympify(e).free_symbols if s in self.definitions]
+        while pending:
+            symbol = pending.pop()
+            if symbol in needed:
+                continue
+            needed.add(symbol)
+            pending.extend(s for s in self.definitions[symbol].free_symbols if s in self.definitions)
+        return [(s, d) for s, d in self.definitions.items() if s in needed]
+
+    def expand(self, exprs: list[sp.Expr]) -> list[sp.Expr]:
+        """Substitute the table back into `exprs`, returns plain expressions."""
+        expanded: dict[sp.Dummy, sp.Expr] = {}
+        for symbol, definition in self.dependencies(exprs):
+            expanded[symbol] = definition.xreplace(expanded)
+        return [sp.sympify(e).xreplace(expanded) for e in exprs]
+
+@dataclass
+class SharedState:
+    """
+    A state (statevector, measurement branches or density matrices) stored as a CSE DAG.
+
+    Attributes:
+        subexpressions: (symbol, definition) pairs in evaluation order,
+            a definition only references symbols listed before it.
+        state: statevector (sp.Matrix), list[MeasurementBranch] or dict of density matrices
+            keyed by classical record, written in terms of those symbols.
+    """
+    subexpressions: list[tuple[sp.Dummy, sp.Expr]]
+    state: object
+
+    def expand(self):
+        """Returns the state with every subexpression substituted back in."""
+        expanded: dict[sp.Dummy, sp.Expr] = {}
+        for symbol, definition in self.subexpressions:
+            expanded[symbol] = definition.xreplace(expanded)
+        if isinstance(self.state, sp.MatrixBase):
+            return self.state.xreplace(expanded)
+        if isinstance(self.state, dict):
+            return {key: rho.xreplace(expanded) for key, rho in self.state.items()}
+        return [
+            b.__class__(b.measured_bits, sp.sympify(b.prob).xreplace(expanded), b.state.xreplace(expanded), b.clbit_results)
+            for b in self.state
+        ]
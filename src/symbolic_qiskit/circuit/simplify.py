@@ -0,0 +1,143 @@
+import signal
+import threading
+from dataclasses import dataclass
+from typing import Callable, Hashable
+
+import sympy as sp
+
+from .parallel import parallel_map
+from ..layer import half_angle_form
+
+SimplifyStrategy = str | Callable[[sp.Expr], sp.Expr]
+
+class _BudgetExceeded(BaseException):
+    # BaseException so that sympy's internal `except Exception` blocks don't swallow it
+    pass
+
+def half_angle_canonical(expr: sp.Expr) -> sp.Expr:
+    """
+    Rewrite an expression as a polynomial in cos(θ/2), sin(θ/2) of each real symbol θ,
+    with sin(θ/2)**2 reduced to 1 - cos(θ/2)**2.
+
+    Returns the input unchanged if it is not polynomial in the half-angle generators
+    (e.g. θ/4 angles, or trig functions inside Abs).
+    """
+    symbols = sorted((s for s in expr.free_symbols if s.is_real), key=str)
+    if not symbols:
+        return expr
+
+    generators = {s: (sp.Dummy(f"c_{s.name}"), sp.Dummy(f"s_{s.name}")) for s in symbols}
+
+    try:
+        e = half_angle_form(expr, generators)
+        gens = [g for s in symbols for g in reversed(generators[s])]
+        numer, denom = sp.fraction(sp.together(sp.expand(e)))
+        numer, denom = _reduce_unit_circle(numer, gens), _reduce_unit_circle(denom, gens)
+    except (ValueError, sp.PolynomialError):
+        return expr
+
+    back = {}
+    for s, (c, sn) in generators.items():
+        back[c] = sp.cos(s / 2)
+        back[sn] = sp.sin(s / 2)
+    return (numer / denom).xreplace(back)
+
+def _reduce_unit_circle(expr: sp.Expr, gens: list[sp.Symbol]) -> sp.Expr:
+    # gens = [s_0, c_0, s_1, c_1, ...], replace s**2 -> 1 - c**2 for every pair
+    poly = sp.Poly(expr, *gens)
+    terms = []
+    for monom, coeff in poly.terms():
+        term = coeff
+        for i in range(0, len(gens), 2):
+            s, c = gens[i], gens[i + 1]
+            e_s, e_c = monom[i], monom[i + 1]
+            term *= s ** (e_s % 2) * (1 - c ** 2) ** (e_s // 2) * c ** e_c
+        terms.append(term)
+    return sp.expand(sp.Add(*terms))
+
+SIMPLIFY_STRATEGIES: dict[str, Callable[[sp.Expr], sp.Expr]] = {
+    "simplify": sp.simplify,
+    "trigsimp": sp.trigsimp,
+    "cancel": sp.cancel,
+    "expand_complex": sp.expand_complex,
+    "half_angle": half_angle_canonical,
+}
+
+def resolve_strategy(strategy: SimplifyStrategy) -> Callable[[sp.Expr], sp.Expr]:
+    if callable(strategy):
+        return strategy
+    if strategy not in SIMPLIFY_STRATEGIES:
+        raise ValueError(
+            f"Invalid simplify strategy: '{strategy}'. Must be a callable or one of {list(SIMPLIFY_STRATEGIES)}."
+        )
+    return SIMPLIFY_STRATEGIES[strategy]
+
+@dataclass(frozen=True)
+class SimplifyOptions:
+    """
+    Attributes:
+        strategy: name in SIMPLIFY_STRATEGIES or a callable Expr -> Expr (picklable if workers > 1)
+        timeout: per-expression wall-clock budget in seconds, the expression is kept unsimplified
+            when exceeded. Only enforced where SIGALRM is available (POSIX, main thread of each process).
+        workers: if > 1, expressions are simplified over a process pool of this size
+    """
+    strategy: SimplifyStrategy = "simplify"
+    timeout: float | None = None
+    workers: int | None = None
+
+    def __post_init__(self):
+        resolve_strategy(self.strategy)
+
+    def with_overrides(self, strategy: SimplifyStrategy | None = None, workers: int | None = None) -> "SimplifyOptions":
+        return SimplifyOptions(
+            strategy=self.strategy if strategy is None else strategy,
+            timeout=self.timeout,
+            workers=self.workers if workers is None else workers,
+        )
+
+    @property
+    def key(self) -> Hashable:
+        # identifies the simplified result, independent of how many workers computed it
+        return (self.strategy, self.timeout)
+
+class Simplifier:
+    """Picklable per-expression simplifier with an optional wall-clock budget."""
+
+    def __init__(self, strategy: SimplifyStrategy, timeout: float | None):
+        self.strategy = strategy
+        self.timeout = timeout
+
+    def __call__(self, expr: sp.Expr) -> sp.Expr:
+        func = resolve_strategy(self.strategy)
+        if (
+            self.timeout is None
+            or not hasattr(signal, "setitimer")
+            or threading.current_thread() is not threading.main_thread()
+        ):
+            return func(expr)
+
+        def on_alarm(signum, frame):
+            raise _BudgetExceeded
+
+        previous = signal.signal(signal.SIGALRM, on_alarm)
+        try:
+            try:
+                signal.setitimer(signal.ITIMER_REAL, self.timeout)
+                return func(expr)
+            finally:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+        except _BudgetExceeded:
+            return expr
+        finally:
+            signal.signal(signal.SIGALRM, previous)
+
+def simplify_exprs(exprs: list[sp.Expr], options: SimplifyOptions) -> list[sp.Expr]:
+    simplifier = Simplifier(options.strategy, options.timeout)
+    return parallel_map(simplifier, exprs, options.workers)
+
+def simplify_matrix(M: sp.Matrix, options: SimplifyOptions) -> sp.Matrix:
+    # only nonzero entries are simplified, zeros stay in place
+    dok = M.todok()
+    simplified = simplify_exprs(list(dok.values()), options)
+    entries = {key: expr for key, expr in zip(dok.keys(), simplified) if expr != 0}
+    return M.__class__(sp.SparseMatrix(M.rows, M.cols, entries))
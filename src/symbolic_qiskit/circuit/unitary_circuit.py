@@ -2,8 +2,10 @@ from typing import Literal
 
 import sympy as sp
 
-from .base import Chunk, BarrierLayer, StandardGateChunk
+from .base import Arithmetic, Chunk, BarrierLayer, StandardGateChunk
 from .circuit_backend import CircuitBackend
+from .checkpoint import CheckpointPolicy
+from .simplify import SimplifyOptions, SimplifyStrategy, simplify_matrix
 from .utils import _use_notebook, _display_expr
 
 class UnitaryCircuitBackend(CircuitBackend):
@@ -12,70 +14,73 @@ class UnitaryCircuitBackend(CircuitBackend):
         chunks: list[Chunk | BarrierLayer],
         num_qubits: int,
         simplify_on_build: bool,
-        global_phase: float|sp.Expr
+        global_phase: float|sp.Expr,
+        simplify_options: SimplifyOptions | None = None,
+        shared_subexpressions: bool = False,
+        checkpoint_policy: CheckpointPolicy | None = None,
+        arithmetic: Arithmetic = "sympy",
     ):
-        super().__init__(chunks, num_qubits, simplify_on_build, global_phase)
-        self.state_at_barrier: dict[str, sp.Matrix] = {}
-        self.state_is_simplified: dict[str, bool] = {}
+        super().__init__(
+            chunks, num_qubits, simplify_on_build, global_phase, simplify_options, shared_subexpressions, checkpoint_policy,
+            arithmetic,
+        )
 
-        self.final_state_vector = self.evolve()
-        self.final_state_is_simplified: bool = simplify_on_build
-
-    def evolve(self) -> sp.Matrix:
+    def _initial_state(self) -> sp.Matrix:
         psi: sp.Matrix = sp.zeros(2 ** self.num_qubits, 1)
         psi[0] = sp.exp(sp.I * self.global_phase)
+        return psi
 
-        for chunk, U_chunk in zip(self.chunks, self.chunk_matrices):
-            if isinstance(chunk, StandardGateChunk):
-                psi = U_chunk @ psi
-            elif isinstance(chunk, BarrierLayer):
-                label = chunk.label
-                if label is not None:
-                    state = psi.applyfunc(sp.simplify) if self.simplify_on_build else psi
-                    self.state_at_barrier[label] = state
-                    self.state_is_simplified[label] = self.simplify_on_build
-        return psi.applyfunc(sp.simplify) if self.simplify_on_build else psi
-    
-    def _simplify_state(self, label: str | None) -> sp.Matrix:
-        # if not simplified yet, simplify and cache result
-        # if simplified, return from cache
-        if label is None:
-            if not self.final_state_is_simplified:
-                self.final_state_vector = self.final_state_vector.applyfunc(sp.simplify)
-                self.final_state_is_simplified = True
-            return self.final_state_vector
+    def _apply_chunk(self, chunk: Chunk | BarrierLayer, psi: sp.Matrix) -> sp.Matrix:
+        if isinstance(chunk, StandardGateChunk):
+            return chunk.apply_to_state(psi, self.num_qubits, self.arithmetic)
+        return psi
 
-        if not self.state_is_simplified.get(label, False):
-            self.state_at_barrier[label] = self.state_at_barrier[label].applyfunc(sp.simplify)
-            self.state_is_simplified[label] = True
-        return self.state_at_barrier[label]
+    def _apply_chunks(self, chunks: list[Chunk | BarrierLayer], psi: sp.Matrix) -> sp.Matrix:
+        if self.arithmetic == "sympy":
+            return super()._apply_chunks(chunks, psi)
+        # one conversion into the polynomial ring for each run of chunks instead of one per chunk,
+        # repeated blocks are applied on their own since they may be applied as a matrix power
+        def apply_layers(layers, psi):
+            return StandardGateChunk(layers).apply_to_state(psi, self.num_qubits, self.arithmetic) if layers else psi
 
-    def statevector(self, label: str|None, simplify: bool) -> sp.Matrix:
-        if label is None:
-            return self._simplify_state(None) if simplify else self.final_state_vector
+        layers = []
+        for chunk in chunks:
+            if not isinstance(chunk, StandardGateChunk):
+                continue
+            if chunk.repeat == 1:
+                layers.extend(chunk.layers)
+                continue
+            psi = apply_layers(layers, psi)
+            layers = []
+            psi = chunk.apply_to_state(psi, self.num_qubits, self.arithmetic)
+        return apply_layers(layers, psi)
 
-        if label not in self.label_to_idx:
-            raise KeyError(
-                f"Barrier label '{label}' not found. Available labels: {self.barrier_labels}"
-            )
-        
-        return self._simplify_state(label) if simplify else self.state_at_barrier[label]
+    def _apply_phase(self, psi: sp.Matrix, factor: sp.Expr) -> sp.Matrix:
+        return psi * factor
+
+    def _simplify_state(self, psi: sp.Matrix, options: SimplifyOptions) -> sp.Matrix:
+        return simplify_matrix(psi, options)
+
+    def _state_exprs(self, psi: sp.Matrix) -> list[sp.Expr]:
+        return list(psi)
+
+    def _rebuild_state(self, psi: sp.Matrix, exprs: list[sp.Expr]) -> sp.Matrix:
+        return sp.Matrix(exprs)
+
+    def statevector(self, label: str|None, simplify: bool | SimplifyStrategy, expand: bool = True) -> sp.Matrix:
+        return self._query(label, simplify, expand)
     
-    def probabilities(self, label: str|None, simplify: bool) -> sp.Matrix:
-        psi = self.statevector(label=label, simplify=simplify)
+    def probabilities(self, label: str|None, simplify: bool | SimplifyStrategy, expand: bool = True) -> sp.Matrix:
+        psi = self.statevector(label=label, simplify=simplify, expand=expand)
         probs: sp.Matrix = psi.H.T.multiply_elementwise(psi)
-        if simplify:
-            probs = probs.applyfunc(sp.simplify)
+        options = self._resolve_simplify(simplify)
+        if options:
+            probs = simplify_matrix(probs, options)
         return probs
     
-    def simplify(self) -> None:
-        for label in self.state_at_barrier:
-            self._simplify_state(label)
-        self._simplify_state(None)
-    
     def report(self, 
         label: Literal["*", None] | str,
-        simplify: bool,
+        simplify: bool | SimplifyStrategy,
         output: Literal["auto", "terminal", "notebook"],
         notation: Literal["dirac", "column"],
     ) -> None:
@@ -89,7 +94,7 @@ class UnitaryCircuitBackend(CircuitBackend):
         else:
             self._report_state(label, simplify, use_nb, use_dirac)
     
-    def _report_state(self, label: str|None, simplify: bool, use_nb: bool, use_dirac: bool):
+    def _report_state(self, label: str|None, simplify: bool | SimplifyStrategy, use_nb: bool, use_dirac: bool):
         if label is None:
             print('- Final statevector:')
         else:
@@ -1,10 +1,38 @@
 import sympy as sp
 import qiskit.circuit as qcc
 from .standard_gates import FULL_GATE_REGISTRY, SUPPORTED_GATES
+from .cache import LRUCache, CacheInfo
 
-def gate_to_sympy_matrix(op: qcc.Instruction) -> sp.Matrix:
+_gate_matrix_cache = LRUCache(maxsize=4096)
+
+def gate_param_key(p) -> tuple:
+    # same normalization as `parse_param`: parameters map to real symbols by name
+    if isinstance(p, (int, float)):
+        return ('num', float(p))
+    if isinstance(p, qcc.ParameterExpression):
+        return ('expr', str(p))
+    raise TypeError(f"Unsupported parameter type: {type(p)}")
+
+def gate_to_sympy_matrix(op: qcc.Instruction) -> sp.ImmutableMatrix:
     name = op.name.lower()
     if name not in SUPPORTED_GATES:
         raise NotImplementedError(f"Gate '{name}' not supported.")
     gate_class = FULL_GATE_REGISTRY[name]
-    return gate_class(op).matrix()
\ No newline at end of file
+    key = (name, tuple(gate_param_key(p) for p in op.params))
+    return _gate_matrix_cache.get(key, lambda: sp.ImmutableMatrix(gate_class(op).matrix()))
+
+def is_diagonal_gate(name: str) -> bool:
+    return FULL_GATE_REGISTRY[name.lower()].diagonal
+
+def is_monomial_gate(name: str) -> bool:
+    return FULL_GATE_REGISTRY[name.lower()].monomial
+
+def gate_num_ctrl_qubits(name: str) -> int:
+    return FULL_GATE_REGISTRY[name.lower()].num_ctrl_qubits
+
+def gate_matrix_cache_info() -> CacheInfo:
+    """Hits, misses and size of the gate matrix cache keyed by (gate name, parameters)."""
+    return _gate_matrix_cache.info()
+
+def clear_gate_matrix_cache() -> None:
+    _gate_matrix_cache.clear()
@@ -5,6 +5,14 @@ from .utils import parse_param
 
 
 class Gate(ABC):
+    # diagonal gates only multiply amplitudes by phases, the evolution applies them elementwise
+    diagonal: bool = False
+    # non-diagonal monomial gates (one nonzero per row) permute amplitudes with phases, applied as an index gather
+    monomial: bool = False
+    # the first num_ctrl_qubits qubits are controls: the matrix is the identity except for its last
+    # (target) block, which is applied only to the amplitudes where every control is 1
+    num_ctrl_qubits: int = 0
+
     def __init__(self, gate: qcc.Instruction):
         self.gate = gate
 
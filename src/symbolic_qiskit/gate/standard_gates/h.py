@@ -9,6 +9,8 @@ class HGate(ZeroParamGate):
         ])
 
 class CHGate(ZeroParamGate):
+    num_ctrl_qubits = 1
+
     def matrix(self):
         return sp.Matrix([
             [1, 0, 0, 0],
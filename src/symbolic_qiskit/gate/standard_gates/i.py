@@ -2,6 +2,7 @@ import sympy as sp
 from ..base import ZeroParamGate
 
 class IGate(ZeroParamGate):
+    diagonal = True
 
     def matrix(self):
         return sp.eye(2)
\ No newline at end of file
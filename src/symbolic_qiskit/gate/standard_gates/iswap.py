@@ -2,6 +2,8 @@ import sympy as sp
 from ..base import ZeroParamGate
 
 class iSwapGate(ZeroParamGate):
+    monomial = True
+
     def matrix(self):
         return sp.Matrix([
             [1, 0, 0, 0],
@@ -2,6 +2,8 @@ import sympy as sp
 from ..base import OneParamGate
 
 class PhaseGate(OneParamGate):
+    diagonal = True
+
     def matrix(self):
         lam = self.theta
         return sp.Matrix([
@@ -10,6 +12,8 @@ class PhaseGate(OneParamGate):
         ])
 
 class CPhaseGate(OneParamGate):
+    diagonal = True
+
     def matrix(self):
         lam = self.theta
         return sp.Matrix([
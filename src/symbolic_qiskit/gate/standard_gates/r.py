@@ -14,6 +14,8 @@ class RGate(TwoParamGate):
         ])
 
 class CRGate(TwoParamGate):
+    num_ctrl_qubits = 1
+
     def matrix(self):
         theta, phi = self.theta, self.phi
         cos = sp.cos(theta / 2)
@@ -10,6 +10,8 @@ class RXGate(OneParamGate):
         ])
 
 class CRXGate(OneParamGate):
+    num_ctrl_qubits = 1
+
     def matrix(self):
         theta = self.theta
         return sp.Matrix([
@@ -10,6 +10,8 @@ class RYGate(OneParamGate):
         ])
 
 class CRYGate(OneParamGate):
+    num_ctrl_qubits = 1
+
     def matrix(self):
         theta = self.theta
         return sp.Matrix([
@@ -2,6 +2,8 @@ import sympy as sp
 from ..base import OneParamGate
 
 class RZGate(OneParamGate):
+    diagonal = True
+
     def matrix(self):
         lam = self.theta
         return sp.Matrix([
@@ -10,6 +12,8 @@ class RZGate(OneParamGate):
         ])
 
 class CRZGate(OneParamGate):
+    diagonal = True
+
     def matrix(self):
         lam = self.theta
         return sp.Matrix([
@@ -2,6 +2,8 @@ import sympy as sp
 from ..base import OneParamGate
 
 class RZZGate(OneParamGate):
+    diagonal = True
+
     def matrix(self):
         theta = self.theta
         exp_pos = sp.exp(sp.I * theta / 2)
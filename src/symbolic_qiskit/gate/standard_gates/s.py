@@ -2,6 +2,8 @@ import sympy as sp
 from ..base import ZeroParamGate
 
 class SGate(ZeroParamGate):
+    diagonal = True
+
     def matrix(self):
         return sp.Matrix([
             [1, 0],
@@ -9,6 +11,8 @@ class SGate(ZeroParamGate):
         ])
 
 class SdgGate(ZeroParamGate):
+    diagonal = True
+
     def matrix(self):
         return sp.Matrix([
             [1, 0],
@@ -16,6 +20,8 @@ class SdgGate(ZeroParamGate):
         ])
 
 class CSGate(ZeroParamGate):
+    diagonal = True
+
     def matrix(self):
         return sp.Matrix([
             [1, 0, 0, 0],
@@ -25,6 +31,8 @@ class CSGate(ZeroParamGate):
         ])
 
 class CSdgGate(ZeroParamGate):
+    diagonal = True
+
     def matrix(self):
         return sp.Matrix([
             [1, 0, 0, 0],
@@ -2,6 +2,8 @@ import sympy as sp
 from ..base import ZeroParamGate
 
 class SwapGate(ZeroParamGate):
+    monomial = True
+
     def matrix(self):
         return sp.Matrix([
             [1, 0, 0, 0],
@@ -11,6 +13,8 @@ class SwapGate(ZeroParamGate):
         ])
 
 class CSWAPGate(ZeroParamGate):
+    monomial = True
+
     def matrix(self):
         mat = sp.eye(8)
         mat[5, 5] = 0  # |101⟩
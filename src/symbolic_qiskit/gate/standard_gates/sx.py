@@ -16,6 +16,8 @@ class SXdgGate(ZeroParamGate):
         ])
 
 class CSXGate(ZeroParamGate):
+    num_ctrl_qubits = 1
+
     def matrix(self):
         return sp.Matrix([
             [1, 0, 0, 0],
@@ -25,6 +27,8 @@ class CSXGate(ZeroParamGate):
         ])
 
 class CSXdgGate(ZeroParamGate):
+    num_ctrl_qubits = 1
+
     def matrix(self):
         return sp.Matrix([
             [1, 0, 0, 0],
@@ -2,6 +2,8 @@ import sympy as sp
 from ..base import ZeroParamGate
 
 class TGate(ZeroParamGate):
+    diagonal = True
+
     def matrix(self):
         return sp.Matrix([
             [1, 0],
@@ -9,6 +11,8 @@ class TGate(ZeroParamGate):
         ])
 
 class TdgGate(ZeroParamGate):
+    diagonal = True
+
     def matrix(self):
         return sp.Matrix([
             [1, 0],
@@ -16,6 +20,8 @@ class TdgGate(ZeroParamGate):
         ])
 
 class CTGate(ZeroParamGate):
+    diagonal = True
+
     def matrix(self):
         return sp.Matrix([
             [1, 0, 0, 0],
@@ -25,6 +31,8 @@ class CTGate(ZeroParamGate):
         ])
 
 class CTdgGate(ZeroParamGate):
+    diagonal = True
+
     def matrix(self):
         return sp.Matrix([
             [1, 0, 0, 0],
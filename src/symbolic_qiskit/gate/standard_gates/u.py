@@ -11,6 +11,8 @@ class UGate(ThreeParamGate):
         ])
 
 class CUGate(FourParamGate):
+    num_ctrl_qubits = 1
+
     def matrix(self):
         theta, phi, lam = self.theta, self.phi, self.lam
         cos = sp.cos(theta / 2)
@@ -3,6 +3,8 @@ from ..base import OneParamGate
 from ..utils import sp_exp_i
 
 class U1Gate(OneParamGate):
+    diagonal = True
+
     def matrix(self):
         theta = self.theta
         return sp.Matrix([
@@ -11,6 +13,8 @@ class U1Gate(OneParamGate):
         ])
 
 class CU1Gate(OneParamGate):
+    diagonal = True
+
     def matrix(self):
         lam = self.theta
         return sp.Matrix([
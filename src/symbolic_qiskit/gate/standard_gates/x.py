@@ -2,6 +2,7 @@ import sympy as sp
 from ..base import ZeroParamGate
 
 class XGate(ZeroParamGate):
+    monomial = True
 
     def matrix(self):
         return sp.Matrix([
@@ -10,6 +11,7 @@ class XGate(ZeroParamGate):
         ])
 
 class CXGate(ZeroParamGate):
+    monomial = True
 
     def matrix(self):
         return sp.Matrix([
@@ -20,6 +22,8 @@ class CXGate(ZeroParamGate):
         ])
 
 class CCXGate(ZeroParamGate):
+    monomial = True
+
     def matrix(self):
         mat = sp.eye(8)
         mat[6,6] = 0
@@ -35,6 +39,8 @@ class C3SXGate(ZeroParamGate):
         return mat
 
 class RCCXGate(ZeroParamGate):
+    monomial = True
+
     def matrix(self):
         mat = sp.eye(8)
         mat[5, 5] = -1
@@ -45,6 +51,8 @@ class RCCXGate(ZeroParamGate):
         return mat
 
 class RC3XGate(ZeroParamGate):
+    monomial = True
+
     def matrix(self):
         mat = sp.eye(16)
         mat[12, 12] = sp.I
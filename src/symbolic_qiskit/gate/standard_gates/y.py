@@ -2,6 +2,8 @@ import sympy as sp
 from ..base import ZeroParamGate
 
 class YGate(ZeroParamGate):
+    monomial = True
+
     def matrix(self):
         return sp.Matrix([
             [0, -sp.I],
@@ -9,6 +11,8 @@ class YGate(ZeroParamGate):
         ])
 
 class CYGate(ZeroParamGate):
+    monomial = True
+
     def matrix(self):
         return sp.Matrix([
             [1, 0, 0, 0],
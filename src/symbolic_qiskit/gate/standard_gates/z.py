@@ -2,6 +2,8 @@ import sympy as sp
 from ..base import ZeroParamGate
 
 class ZGate(ZeroParamGate):
+    diagonal = True
+
     def matrix(self):
         return sp.Matrix([
             [1, 0],
@@ -9,6 +11,8 @@ class ZGate(ZeroParamGate):
         ])
 
 class CZGate(ZeroParamGate):
+    diagonal = True
+
     def matrix(self):
         return sp.Matrix([
             [1, 0, 0, 0],
@@ -18,6 +22,8 @@ class CZGate(ZeroParamGate):
         ])
 
 class CCZGate(ZeroParamGate):
+    diagonal = True
+
     def matrix(self):
         mat = sp.eye(8)
         mat[7, 7] = -1
@@ -1,4 +1,10 @@
-from .base import StandardGate, Barrier, Measurement, QCLayer, StandardGateLayer, BarrierLayer, MeasurementLayer, MeasurementBranch
-from .build import circuit_to_layers
-from .standard_layer import construct_layer_matrix
-from .measurement_layer import apply_measurement_layer
\ No newline at end of file
+from .base import StandardGate, FusedGate, Barrier, Measurement, Reset, QCLayer, StandardGateLayer, BarrierLayer, MeasurementLayer, ResetLayer, MeasurementBranch
+from .build import circuit_to_layers, circuit_to_operations, operations_to_layers, circuit_instructions, FlatInstruction
+from .fusion import fuse_operations
+from .standard_layer import construct_layer_matrix, apply_gate_to_amplitudes, apply_layer_to_state, apply_gate_to_density
+from .standard_layer import apply_diagonal_to_amplitudes, apply_permutation_to_amplitudes, apply_controlled_to_amplitudes
+from .standard_layer import layer_diagonal, scale_rows, permute_rows, combine_rows, multiply_monomial, matrix_power, apply_layer_to_matrix
+from .exact import is_constant_gate, exact_domain, polynomial_domain, half_angle_domain, half_angle_form, DomainFinder, DomainElements
+from .exact import apply_gates_in_domain, apply_gates_exactly, domain_matrix_product, exact_layers_matrix
+from .measurement_layer import apply_measurement_layer, apply_measurement_layer_to_density, ClbitKey
+from .reset_layer import apply_reset_layer_to_density
\ No newline at end of file
@@ -4,7 +4,7 @@ from typing import List, Tuple, Dict
 import sympy as sp
 import qiskit.circuit as qcc
 
-from ..gate import gate_to_sympy_matrix
+from ..gate import gate_to_sympy_matrix, is_diagonal_gate, is_monomial_gate, gate_num_ctrl_qubits
 
 @dataclass
 class Operation:
@@ -17,9 +17,73 @@ class StandardGate(Operation):
         return f"({self.op.name}, q={self.q_idxs})"
     
     @property
-    def sym_matrix(self):
+    def sym_matrix(self) -> sp.ImmutableMatrix:
+        # served from the gate package's LRU cache keyed by (name, params)
         return gate_to_sympy_matrix(self.op)
-    
+
+    @property
+    def is_diagonal(self) -> bool:
+        return is_diagonal_gate(self.op.name)
+
+    @property
+    def is_monomial(self) -> bool:
+        return is_monomial_gate(self.op.name)
+
+    @property
+    def permutation(self) -> tuple[tuple[int, ...], tuple[sp.Expr, ...]]:
+        """
+        Monomial form of the gate matrix, (perm, phases) with M[a, perm[a]] = phases[a] the only nonzero of row a
+        """
+        M = self.sym_matrix
+        perm = tuple(next(b for b in range(M.cols) if M[a, b] != 0) for a in range(M.rows))
+        return perm, tuple(M[a, b] for a, b in enumerate(perm))
+
+    @property
+    def control(self) -> tuple[list[int], int, sp.ImmutableMatrix] | None:
+        """
+        Controlled form of the gate, (control qubits, control state, target block), None if not a controlled gate
+
+        The control state is the local basis index of the control qubits (control_qidxs[0] most significant)
+        on which the target block acts, the gate is the identity elsewhere.
+        """
+        num_ctrl = gate_num_ctrl_qubits(self.op.name)
+        if not num_ctrl:
+            return None
+        M = self.sym_matrix
+        dim = M.rows >> num_ctrl
+        ctrl_state = 2 ** num_ctrl - 1
+        return self.q_idxs[:num_ctrl], ctrl_state, M[ctrl_state * dim:, ctrl_state * dim:]
+
+
+@dataclass
+class FusedGate(StandardGate):
+    """
+    Product of consecutive StandardGates on a few qubits, applied as a single gate.
+
+    `matrix` is the (2^k x 2^k) product, q_idxs[0] is its most significant bit as for any StandardGate.
+    """
+    gates: List[StandardGate] = field(default_factory=list)
+    matrix: sp.ImmutableMatrix = None
+
+    def __repr__(self) -> str:
+        names = ','.join(g.op.name for g in self.gates)
+        return f"(fused[{names}], q={self.q_idxs})"
+
+    @property
+    def sym_matrix(self) -> sp.ImmutableMatrix:
+        return self.matrix
+
+    @property
+    def is_diagonal(self) -> bool:
+        return all(g.is_diagonal for g in self.gates)
+
+    @property
+    def is_monomial(self) -> bool:
+        return not self.is_diagonal and all(g.is_diagonal or g.is_monomial for g in self.gates)
+
+    @property
+    def control(self) -> None:
+        return None
 
 @dataclass
 class Barrier(Operation):
@@ -32,6 +96,11 @@ class Measurement(Operation):
     def __repr__(self):
         return f"({self.op.name}, q={self.q_idxs}, c={self.c_idxs})"
 
+@dataclass
+class Reset(Operation):
+    def __repr__(self):
+        return f"({self.op.name}, q={self.q_idxs})"
+
 @dataclass
 class QCLayer:
     ops: list[Operation]
@@ -68,6 +137,10 @@ class BarrierLayer(QCLayer):
 class MeasurementLayer(QCLayer):
     ops: list[Measurement]
 
+@dataclass
+class ResetLayer(QCLayer):
+    ops: list[Reset]
+
 @dataclass(frozen=True)
 class MeasurementBranch:
     measured_bits: Tuple[int, ...]
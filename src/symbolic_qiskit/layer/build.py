@@ -1,19 +1,72 @@
+from typing import NamedTuple
+
 import qiskit.circuit as qcc
 from qiskit import QuantumCircuit
 
-from .base import StandardGate, Barrier, Measurement, QCLayer, StandardGateLayer, BarrierLayer, MeasurementLayer
+from .base import Operation, StandardGate, Barrier, Measurement, Reset, QCLayer, StandardGateLayer, BarrierLayer, MeasurementLayer, ResetLayer
+from .fusion import fuse_operations
 from ..gate import SUPPORTED_GATES
 
-def circuit_to_layers(qc: QuantumCircuit) -> list[QCLayer]:
+class FlatInstruction(NamedTuple):
+    operation: qcc.Instruction
+    qubits: tuple[int, ...]
+    clbits: tuple[int, ...]
+
+def circuit_instructions(qc: QuantumCircuit) -> list[FlatInstruction]:
+    """Instructions of a circuit with its qubits and clbits replaced by their indices"""
+    qubit_to_idx = {q: i for i, q in enumerate(qc.qubits)}
+    clbit_to_idx = {c: i for i, c in enumerate(qc.clbits)}
+    return [
+        FlatInstruction(
+            inst.operation,
+            tuple(qubit_to_idx[q] for q in inst.qubits),
+            tuple(clbit_to_idx[c] for c in inst.clbits),
+        )
+        for inst in qc.data
+    ]
+
+def circuit_to_layers(qc: QuantumCircuit | list[FlatInstruction], fusion_width: int | None = None) -> list[QCLayer]:
+    """
+    Args:
+        qc (QuantumCircuit | list[FlatInstruction]): circuit decomposed to supported gates, measurements,
+            resets and barriers, or its instructions on qubit and clbit indices
+        fusion_width (int | None): if given, runs of gates acting on at most this many qubits
+            are fused into one gate before layering (see `fuse_operations`)
+    """
+    operations = circuit_to_operations(qc)
+    if fusion_width is not None:
+        operations = fuse_operations(operations, fusion_width)
+    return operations_to_layers(operations)
+
+def circuit_to_operations(qc: QuantumCircuit | list[FlatInstruction]) -> list[Operation]:
+    instructions = circuit_instructions(qc) if isinstance(qc, QuantumCircuit) else qc
+
+    operations = []
+    for op, qubits, clbits in instructions:
+        q_idxs = list(qubits)
+        c_idxs = list(clbits)
+
+        if op.name == "barrier":
+            operations.append(Barrier(op, q_idxs, op.label))
+        elif op.name == "measure":
+            operations.append(Measurement(op, q_idxs, c_idxs))
+        elif op.name == "reset":
+            operations.append(Reset(op, q_idxs))
+        elif op.name in SUPPORTED_GATES:
+            operations.append(StandardGate(op, q_idxs))
+        elif op.name == 'delay':
+            continue
+        else:
+            raise ValueError(f"Unsupported operation '{op.name}' in circuit, supported operations: {SUPPORTED_GATES}")
+    return operations
+
+def operations_to_layers(operations: list[Operation]) -> list[QCLayer]:
     layers = []
     current_ops = []
     current_type = None
     active_q = set()
     active_c = set()
 
-    qubit_to_idx = {q: i for i, q in enumerate(qc.qubits)}
-    clbit_to_idx = {c: i for i, c in enumerate(qc.clbits)}
-
     def flush():
         nonlocal current_ops, current_type, active_q, active_c
         if not current_ops:
@@ -24,43 +77,45 @@ def circuit_to_layers(qc: QuantumCircuit) -> list[QCLayer]:
             layers.append(MeasurementLayer(current_ops))
         elif current_type == 'barrier':
             layers.append(BarrierLayer(current_ops))
+        elif current_type == 'reset':
+            layers.append(ResetLayer(current_ops))
         current_ops = []
         active_q.clear()
         active_c.clear()
         current_type = None
 
-    for inst in qc.data:
-        op: qcc.Instruction = inst.operation
-        q_idxs = [qubit_to_idx[q] for q in inst.qubits]
-        c_idxs = [clbit_to_idx[c] for c in inst.clbits]
-        q_set = set(q_idxs)
-        c_set = set(c_idxs)
+    for op in operations:
+        q_set = set(op.q_idxs)
 
-        if op.name == "barrier":
+        if isinstance(op, Barrier):
             if current_type not in (None, 'barrier'):
                 flush()
             current_type = 'barrier'
-            current_ops.append(Barrier(op, q_idxs, op.label))
+            current_ops.append(op)
             continue
 
-        elif op.name == "measure":
+        elif isinstance(op, Measurement):
+            c_set = set(op.c_idxs)
             if current_type != 'measure' or (q_set & active_q) or (c_set & active_c):
                 flush()
             current_type = 'measure'
-            current_ops.append(Measurement(op, q_idxs, c_idxs))
+            current_ops.append(op)
             active_q.update(q_set)
             active_c.update(c_set)
 
-        elif op.name in SUPPORTED_GATES:
+        elif isinstance(op, Reset):
+            if current_type != 'reset' or (q_set & active_q):
+                flush()
+            current_type = 'reset'
+            current_ops.append(op)
+            active_q.update(q_set)
+
+        elif isinstance(op, StandardGate):
             if current_type != 'gate' or (q_set & active_q):
                 flush()
             current_type = 'gate'
-            current_ops.append(StandardGate(op, q_idxs))
+            current_ops.append(op)
             active_q.update(q_set)
-        elif op.name == 'delay':
-            continue
-        else:
-            raise ValueError(f"Unsupported operation '{op.name}' in circuit, supported operations: {SUPPORTED_GATES}")
 
     flush()
     return layers
@@ -0,0 +1,265 @@
+from typing import Callable, NamedTuple
+
+import sympy as sp
+from sympy.polys.constructor import construct_domain
+from sympy.polys.domains import QQ
+from sympy.polys.matrices import DomainMatrix
+from sympy.polys.polyerrors import NotAlgebraic, PolynomialError, CoercionFailed
+from sympy.polys.polyutils import parallel_dict_from_expr
+
+from .base import StandardGate, StandardGateLayer
+from .standard_layer import construct_layer_matrix
+from .utils import gate_index_table
+
+class DomainElements(NamedTuple):
+    domain: object
+    elements: list
+    # normal form applied to every computed entry, e.g. reduction modulo cos(θ/2)² + sin(θ/2)² - 1
+    reduce: Callable[[object], object] | None = None
+
+# the input expressions converted into a domain, None if no domain with fast arithmetic fits
+DomainFinder = Callable[[list[sp.Expr]], DomainElements | None]
+
+def is_constant_gate(gate: StandardGate) -> bool:
+    return not gate.sym_matrix.free_symbols
+
+# primitive elements of fields with many radicals are expensive to find, such inputs stay symbolic
+_MAX_RADICALS = 4
+
+# floats with a small power-of-two denominator (0.5 in `(1/2) * Matrix(...)`) are exact rationals
+_MAX_FLOAT_DENOMINATOR = 2 ** 10
+
+def _exact_float(f: sp.Float) -> sp.Expr:
+    r = sp.Rational(float(f))
+    return r if r.q <= _MAX_FLOAT_DENOMINATOR else f
+
+def _algebraic_form(exprs: list[sp.Expr]) -> list[sp.Expr]:
+    # numeric roots of unity like exp(I*pi/4) become radicals, small dyadic floats become rationals
+    exprs = [sp.sympify(e) for e in exprs]
+    exprs = [
+        e.replace(lambda x: isinstance(x, sp.exp) and x.is_number, lambda x: x.rewrite(sp.cos)) if e.has(sp.exp) else e
+        for e in exprs
+    ]
+    return [e.replace(lambda x: x.is_Float, _exact_float) if e.has(sp.Float) else e for e in exprs]
+
+def _radicals(exprs: list[sp.Expr]) -> set[sp.Expr]:
+    return {p for e in exprs for p in e.atoms(sp.Pow) if p.is_number and p.exp.is_Rational and not p.exp.is_Integer}
+
+def _ring_elements(R, reps: list[dict]) -> list:
+    # coefficients repeat a lot (±1/2, sqrt(2)/2, I, ...) and each conversion into an algebraic field
+    # solves a field isomorphism, so every distinct coefficient is converted once
+    A = R.domain
+    coeffs: dict[sp.Expr, object] = {}
+    def convert(c):
+        if c not in coeffs:
+            coeffs[c] = A.from_sympy(c)
+        return coeffs[c]
+    return [R.ring.from_dict({m: convert(c) for m, c in rep.items()}) for rep in reps]
+
+def exact_domain(exprs: list[sp.Expr]):
+    """
+    Smallest exact domain holding every constant expression (e.g. QQ<sqrt(2) + I>), None if there is no such domain.
+
+    Floats that are not small dyadic rationals give RR or CC, floats mixed with radicals only fit in EX,
+    for which there is no fast arithmetic.
+    """
+    exprs = _algebraic_form(exprs)
+    if len(_radicals(exprs)) > _MAX_RADICALS:
+        return None
+    try:
+        K, elements = construct_domain(exprs, extension=True)
+    except NotAlgebraic:
+        return None
+    if K.is_EX or K.is_EXRAW:
+        return None
+    return DomainElements(K, elements)
+
+def polynomial_domain(exprs: list[sp.Expr]):
+    """
+    Polynomial ring over an algebraic field holding every expression, None if there is no such ring.
+
+    Generators are the non-constant atoms (cos(θ/2), sin(θ/2), exp(I*θ/2), ...) and the coefficients
+    live in QQ<I, radicals>. Products are expanded and canonical, relations between generators
+    (cos² + sin² = 1) are not applied. Floats that are not small dyadic rationals are not supported.
+    """
+    exprs = _algebraic_form(exprs)
+    if not any(e.free_symbols for e in exprs):
+        return exact_domain(exprs)
+    if any(e.has(sp.Float) for e in exprs):
+        return None
+    numbers = _radicals(exprs)
+    if len(numbers) > _MAX_RADICALS:
+        return None
+    if any(e.has(sp.I) for e in exprs):
+        numbers.add(sp.I)
+    try:
+        A = QQ.algebraic_field(*numbers) if numbers else QQ
+        # algebraic factors are coefficients, converted once each by `_ring_elements`
+        reps, gens = parallel_dict_from_expr(exprs, extension=True)
+        if not gens:
+            return exact_domain(exprs)
+        R = A.poly_ring(*gens)
+        return DomainElements(R, _ring_elements(R, reps))
+    except (NotAlgebraic, PolynomialError, CoercionFailed):
+        return None
+
+def half_angle_form(expr: sp.Expr, generators: dict[sp.Symbol, tuple[sp.Expr, sp.Expr]]) -> sp.Expr:
+    """
+    Rewrite exp(i k θ/2) as (c + i s)^k for every θ -> (c, s) in `generators`, trigonometric functions
+    are rewritten to exponentials first. The result is not expanded.
+
+    Raises ValueError if an angle is not an integer multiple of a half angle (e.g. θ/4).
+    """
+    halves = {s: sp.Dummy(f"{s.name}_half", real=True) for s in generators}
+
+    def exp_to_generators(arg: sp.Expr) -> sp.Expr:
+        arg = sp.expand(arg)
+        factor, rest = sp.S.One, arg
+        for s, h in halves.items():
+            k = arg.coeff(h) / sp.I
+            if not k.is_integer:
+                raise ValueError("angle is not an integer multiple of a half angle")
+            c, sn = generators[s]
+            unit = c + sp.I * sn if k > 0 else c - sp.I * sn
+            factor *= unit ** abs(k)
+            rest -= k * sp.I * h
+        return factor * sp.exp(rest)
+
+    e = expr.xreplace({s: 2 * h for s, h in halves.items()}).rewrite(sp.exp)
+    return e.replace(lambda x: isinstance(x, sp.exp), lambda x: exp_to_generators(x.args[0]))
+
+def half_angle_domain(exprs: list[sp.Expr]):
+    """
+    Polynomial ring in sin(θ/2), cos(θ/2) of each parameter θ over QQ<I, radicals>, None if some expression
+    is not polynomial in them (θ/4 angles, floats that are not small dyadic rationals, ...).
+
+    Entries are kept reduced modulo sin(θ/2)² + cos(θ/2)² - 1, a Gröbner basis since the pairs share no
+    generator, so amplitudes that are equal as functions of the parameters get the same representation.
+    """
+    exprs = [sp.sympify(e) for e in exprs]
+    symbols = sorted({s for e in exprs for s in e.free_symbols}, key=str)
+    if not symbols:
+        return exact_domain(exprs)
+    generators = {s: (sp.Dummy(f"c_{s.name}"), sp.Dummy(f"s_{s.name}")) for s in symbols}
+    dummies = [g for s in symbols for g in reversed(generators[s])]
+    try:
+        exprs = _algebraic_form([sp.expand(half_angle_form(e, generators)) for e in exprs])
+        if any(e.has(sp.Float) for e in exprs):
+            return None
+        numbers = _radicals(exprs)
+        if len(numbers) > _MAX_RADICALS:
+            return None
+        if any(e.has(sp.I) for e in exprs):
+            numbers.add(sp.I)
+        A = QQ.algebraic_field(*numbers) if numbers else QQ
+        reps, _ = parallel_dict_from_expr(exprs, gens=dummies)
+    except (ValueError, NotAlgebraic, PolynomialError, CoercionFailed):
+        return None
+
+    R = A.poly_ring(*[f(s / 2) for s in symbols for f in (sp.sin, sp.cos)])
+    gens = R.ring.gens
+    relations = [gens[i] ** 2 + gens[i + 1] ** 2 - 1 for i in range(0, len(gens), 2)]
+
+    def reduce(p):
+        return p.rem(relations)
+
+    try:
+        elements = _ring_elements(R, reps)
+    except (NotAlgebraic, CoercionFailed):
+        return None
+    return DomainElements(R, [reduce(p) for p in elements], reduce)
+
+def apply_gates_in_domain(
+    gates: list[tuple[sp.Matrix, list[int]]],
+    amplitudes: list[sp.Expr],
+    num_qubits: int,
+    find_domain: DomainFinder = exact_domain
+) -> list[sp.Expr] | None:
+    """
+    Apply (matrix, q_idxs) gates to a statevector with the arithmetic of a sympy domain
+
+    Same convention as `apply_matrix_to_amplitudes`. Returns None if `find_domain` finds no domain
+    for the entries, the caller then falls back to symbolic evaluation.
+    """
+    matrices = [[list(M.row(a)) for a in range(M.rows)] for M, _ in gates]
+    entries = [e for rows in matrices for row in rows for e in row]
+    domain = find_domain(entries + list(amplitudes))
+    if domain is None:
+        return None
+    K, elements, reduce = domain
+
+    state = elements[len(entries):]
+    it = iter(elements)
+    for (M, q_idxs), rows in zip(gates, matrices):
+        gate_rows = [
+            [(b, m) for b, m in enumerate(next(it) for _ in row) if m]
+            for row in rows
+        ]
+        new_state = list(state)
+        for idxs in gate_index_table(num_qubits, tuple(q_idxs)).tolist():
+            sub = [state[i] for i in idxs]
+            if not any(sub):
+                continue
+            for i, row in zip(idxs, gate_rows):
+                new_state[i] = sum((m * sub[b] for b, m in row if sub[b]), K.zero)
+                if reduce is not None:
+                    new_state[i] = reduce(new_state[i])
+        state = new_state
+    return [K.to_sympy(a) for a in state]
+
+def apply_gates_exactly(
+    gates: list[tuple[sp.Matrix, list[int]]],
+    amplitudes: list[sp.Expr],
+    num_qubits: int
+) -> list[sp.Expr] | None:
+    """Apply constant gates to a constant statevector in an exact domain, see `apply_gates_in_domain`."""
+    return apply_gates_in_domain(gates, amplitudes, num_qubits, exact_domain)
+
+def domain_matrix_product(
+    matrices: list[sp.SparseMatrix],
+    find_domain: DomainFinder = exact_domain,
+    repeat: int = 1
+) -> sp.SparseMatrix | None:
+    """
+    (matrices[-1] * ... * matrices[0]) ** repeat computed as sparse DomainMatrix products, None if no domain fits
+
+    The power is taken by repeated squaring, O(log repeat) products.
+    """
+    doks = [M.todok() for M in matrices]
+    domain = find_domain([v for dok in doks for v in dok.values()])
+    if domain is None:
+        return None
+    K, elements, reduce = domain
+
+    dim = matrices[0].rows
+
+    def multiply(A: DomainMatrix, B: DomainMatrix) -> DomainMatrix:
+        U = A * B
+        if reduce is not None:
+            U = DomainMatrix({i: {j: reduce(v) for j, v in row.items()} for i, row in U.to_sdm().items()}, (dim, dim), K)
+        return U
+
+    it = iter(elements)
+    U = DomainMatrix.eye(dim, K).to_sparse()
+    for dok in doks:
+        rows: dict[int, dict[int, object]] = {}
+        for (i, j) in dok:
+            rows.setdefault(i, {})[j] = next(it)
+        U = multiply(DomainMatrix(rows, (dim, dim), K), U)
+
+    # powers of U commute, the order of the factors doesn't matter
+    result, k = None, repeat
+    while k:
+        if k & 1:
+            result = U if result is None else multiply(U, result)
+        k >>= 1
+        if k:
+            U = multiply(U, U)
+
+    return sp.SparseMatrix(dim, dim, {
+        (i, j): K.to_sympy(v) for i, row in result.to_sdm().items() for j, v in row.items()
+    })
+
+def exact_layers_matrix(layers: list[StandardGateLayer], num_qubits: int) -> sp.SparseMatrix | None:
+    """Product of constant layer matrices in an exact domain, see `domain_matrix_product`."""
+    return domain_matrix_product([construct_layer_matrix(layer, num_qubits) for layer in layers], exact_domain)
@@ -0,0 +1,72 @@
+import sympy as sp
+
+from .base import Operation, StandardGate, FusedGate, Barrier, StandardGateLayer
+from .standard_layer import apply_layer_to_matrix
+
+def fuse_gates(gates: list[StandardGate]) -> StandardGate:
+    """
+    Multiply consecutive gates into one FusedGate on the union of their qubits (a single gate is returned as is).
+    """
+    if len(gates) == 1:
+        return gates[0]
+
+    qubits = sorted({q for g in gates for q in g.q_idxs}) # local qubit j (little-endian) is qubits[j]
+    local = {q: j for j, q in enumerate(qubits)}
+    M = sp.SparseMatrix.eye(2 ** len(qubits))
+    for g in gates:
+        local_gate = StandardGate(g.op, [local[q] for q in g.q_idxs])
+        M = apply_layer_to_matrix(StandardGateLayer([local_gate]), M, len(qubits))
+
+    return FusedGate(
+        op=None,
+        q_idxs=list(reversed(qubits)),
+        gates=list(gates),
+        matrix=sp.ImmutableMatrix(M),
+    )
+
+def fuse_operations(operations: list[Operation], max_width: int) -> list[Operation]:
+    """
+    Greedily fuse runs of StandardGates into blocks acting on at most `max_width` qubits.
+
+    A gate joins the open blocks on its qubits if their union stays within `max_width`, otherwise those blocks
+    are closed. Barriers close every block, measurements and resets close the blocks on their qubits,
+    so operation order on every qubit is preserved.
+    """
+    if max_width < 1:
+        raise ValueError(f"Invalid fusion width: {max_width}. Must be a positive integer.")
+
+    result: list[Operation] = []
+    open_blocks: dict[int, list[StandardGate]] = {} # qubit -> open block (shared by all qubits of the block)
+
+    def close(block: list[StandardGate]):
+        for q in {q for g in block for q in g.q_idxs}:
+            del open_blocks[q]
+        result.append(fuse_gates(block))
+
+    def close_on(qubits):
+        blocks = {id(open_blocks[q]): open_blocks[q] for q in qubits if q in open_blocks}
+        for block in blocks.values():
+            close(block)
+
+    for op in operations:
+        if not isinstance(op, StandardGate):
+            close_on(list(open_blocks) if isinstance(op, Barrier) else op.q_idxs)
+            result.append(op)
+            continue
+
+        blocks = {id(open_blocks[q]): open_blocks[q] for q in op.q_idxs if q in open_blocks}
+        merged_qubits = set(op.q_idxs).union(*({q for g in b for q in g.q_idxs} for b in blocks.values()))
+        if len(op.q_idxs) > max_width or len(merged_qubits) > max_width:
+            close_on(op.q_idxs)
+            if len(op.q_idxs) > max_width:
+                result.append(op)
+                continue
+            block = [op]
+        else:
+            # open blocks on disjoint qubits commute, their merge order doesn't matter
+            block = [g for b in blocks.values() for g in b] + [op]
+        for q in {q for g in block for q in g.q_idxs}:
+            open_blocks[q] = block
+
+    close_on(list(open_blocks))
+    return result
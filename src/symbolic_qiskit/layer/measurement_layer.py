@@ -3,7 +3,10 @@ from typing import List
 import sympy as sp
 
 from .base import MeasurementBranch, MeasurementLayer
-from .utils import state_vector_projection
+from .utils import state_vector_projection, density_projection_mask
+
+# sorted ((clbit_idx, measured value), ...) identifying a classical record
+ClbitKey = tuple[tuple[int, int], ...]
 
 def branch_on_measurement(
     branch: MeasurementBranch,
@@ -55,4 +58,55 @@ def apply_measurement_layer(
 
         current_branches = new_branches
 
-    return current_branches
\ No newline at end of file
+    return current_branches
+
+def project_density(
+    entries: List[sp.Expr],
+    num_qubits: int,
+    q_idx: int,
+    outcome: int | None
+) -> List[sp.Expr]:
+    """
+    Unnormalized projection P rho P of row-major density matrix entries (4^n) onto `outcome` of qubit q_idx,
+    or the sum over both outcomes (dephasing) if outcome is None. The trace of the result is its probability.
+    """
+    mask = density_projection_mask(num_qubits, q_idx, outcome)
+    return [v if keep else sp.S.Zero for v, keep in zip(entries, mask)]
+
+def apply_measurement_layer_to_density(
+    states: dict[ClbitKey, List[sp.Expr]],
+    measurement_layer: MeasurementLayer,
+    num_qubits: int,
+    condition_on_clbits: bool
+) -> dict[ClbitKey, List[sp.Expr]]:
+    """
+    Apply a MeasurementLayer as a projective channel to unnormalized density matrices keyed by classical record.
+
+    If condition_on_clbits is False, every measurement only dephases the measured qubit and the single
+    key () is kept, so the cost does not grow with the number of measurements.
+    Otherwise each state splits by outcome, states with the same classical record are summed,
+    so there are at most 2^(number of clbits) states. Zero projections are discarded.
+    """
+    for meas in measurement_layer.ops:
+        assert len(meas.q_idxs) == 1 and len(meas.c_idxs) == 1, "Each measurement op must have exactly one qubit and one clbit index"
+
+        q_idx = meas.q_idxs[0]
+        c_idx = meas.c_idxs[0]
+
+        if not condition_on_clbits:
+            states = {key: project_density(entries, num_qubits, q_idx, None) for key, entries in states.items()}
+            continue
+
+        new_states: dict[ClbitKey, List[sp.Expr]] = {}
+        for key, entries in states.items():
+            for measured_value in (0, 1):
+                projected = project_density(entries, num_qubits, q_idx, measured_value)
+                if all(v == 0 for v in projected):
+                    continue
+                new_key = tuple(sorted({**dict(key), c_idx: measured_value}.items()))
+                if new_key in new_states:
+                    projected = [a + b for a, b in zip(new_states[new_key], projected)]
+                new_states[new_key] = projected
+        states = new_states
+
+    return states
@@ -0,0 +1,24 @@
+from typing import List
+
+import sympy as sp
+
+from .base import ResetLayer
+from .utils import density_reset_index_pairs
+
+def reset_density(entries: List[sp.Expr], num_qubits: int, q_idx: int) -> List[sp.Expr]:
+    """
+    Reset qubit q_idx of row-major density matrix entries (4^n), rho -> |0><0| ⓧ Tr_q(rho)
+    """
+    new_entries = [sp.S.Zero] * len(entries)
+    for target, source_0, source_1 in density_reset_index_pairs(num_qubits, q_idx):
+        new_entries[target] = entries[source_0] + entries[source_1]
+    return new_entries
+
+def apply_reset_layer_to_density(
+    entries: List[sp.Expr],
+    reset_layer: ResetLayer,
+    num_qubits: int
+) -> List[sp.Expr]:
+    for op in reset_layer.ops:
+        entries = reset_density(entries, num_qubits, op.q_idxs[0])
+    return entries
@@ -1,15 +1,16 @@
 import sympy as sp
 
-from .base import StandardGateLayer
-from .utils import permute_qubit_unitary
+from .base import StandardGate, StandardGateLayer
+from .utils import permute_qubit_unitary, sparse_kronecker_product
+from .utils import gate_index_table, controlled_index_table, diagonal_index_table, permutation_index_table
 
 def construct_layer_matrix(
     layer: StandardGateLayer,
     num_qubits: int
-) -> sp.Matrix:
+) -> sp.SparseMatrix:
     
     """
-    Construct the symbolic unitary matrix for a StandardGateLayer
+    Construct the sparse symbolic unitary matrix for a StandardGateLayer
 
     Parameters
     ----------
@@ -18,11 +19,14 @@ def construct_layer_matrix(
 
     Returns
     -------
-    U : sp.Matrix
-        symbolic unitary matrix (2^n x 2^n)
+    U : sp.SparseMatrix
+        symbolic unitary matrix (2^n x 2^n), only nonzero entries are stored
 
     """
 
+    if all(op.is_diagonal or op.is_monomial for op in layer.ops):
+        return apply_layer_to_matrix(layer, sp.SparseMatrix.eye(2 ** num_qubits), num_qubits)
+
     sorted_ops = sorted(layer.ops, key=lambda op: -len(op.q_idxs)) # [cx:3,0] [ry:1] num_qubit: 4
     active_qidxs = [idx for op in sorted_ops for idx in op.q_idxs] # [3,0,1]
     active_gates = [op.sym_matrix for op in sorted_ops] # [cx, ry]
@@ -33,7 +37,299 @@ def construct_layer_matrix(
     permuted_gates = active_gates + [sp.eye(2)] * n_non_active # [cx, ry, I]
     
     # kron(cx, ry, I) = cx(3,2) ⓧ ry(1) ⓧ I(0), permuted unitary matrix
-    U_p = sp.kronecker_product(*permuted_gates)
+    U_p = sparse_kronecker_product(*permuted_gates)
     # the permute operater that transform [3,2,1,0] to [3,0,1,2]
     perm = [permuted_qidxs.index(i) for i in reversed(range(num_qubits))] # [0,3,2,1]
-    return permute_qubit_unitary(U_p, perm)
\ No newline at end of file
+    return permute_qubit_unitary(U_p, perm)
+
+def apply_gate_to_amplitudes(
+    gate: StandardGate,
+    amplitudes: list[sp.Expr],
+    num_qubits: int
+) -> list[sp.Expr]:
+    """
+    Apply a StandardGate to a statevector without expanding it to a 2^n x 2^n matrix
+
+    Parameters
+    ----------
+    gate : StandardGate
+    amplitudes : list[sp.Expr]
+        statevector amplitudes (2^n), little-endian qubit order
+    num_qubits : int
+
+    Returns
+    -------
+    new_amplitudes : list[sp.Expr]
+        amplitudes after the gate, costs O(2^n * 2^k) for a k-qubit gate, O(2^n) for a diagonal or monomial gate,
+        O(2^(n-c) * 2^(k-c)) for a gate with c controls
+
+    """
+    if gate.is_diagonal:
+        return apply_diagonal_to_amplitudes(gate.sym_matrix.diagonal(), gate.q_idxs, amplitudes, num_qubits)
+    if gate.is_monomial:
+        return apply_permutation_to_amplitudes(*gate.permutation, gate.q_idxs, amplitudes, num_qubits)
+    if gate.control:
+        ctrl_qidxs, ctrl_state, target = gate.control
+        target_qidxs = gate.q_idxs[len(ctrl_qidxs):]
+        return apply_controlled_to_amplitudes(target, ctrl_qidxs, ctrl_state, target_qidxs, amplitudes, num_qubits)
+    return apply_matrix_to_amplitudes(gate.sym_matrix, gate.q_idxs, amplitudes, num_qubits)
+
+def apply_matrix_to_amplitudes(
+    M: sp.Matrix,
+    q_idxs: list[int],
+    amplitudes: list[sp.Expr],
+    num_qubits: int
+) -> list[sp.Expr]:
+    """
+    Apply a (2^k x 2^k) matrix on qubits `q_idxs` to a statevector, q_idxs[0] is the most significant bit of M
+    """
+    return _apply_to_index_groups(M, gate_index_table(num_qubits, tuple(q_idxs)).tolist(), amplitudes)
+
+def apply_controlled_to_amplitudes(
+    M: sp.Matrix,
+    ctrl_qidxs: list[int],
+    ctrl_state: int,
+    target_qidxs: list[int],
+    amplitudes: list[sp.Expr],
+    num_qubits: int
+) -> list[sp.Expr]:
+    """
+    Apply a (2^t x 2^t) target block only to the amplitudes where the controls are in `ctrl_state`
+    """
+    table = controlled_index_table(num_qubits, tuple(ctrl_qidxs), ctrl_state, tuple(target_qidxs))
+    return _apply_to_index_groups(M, table.tolist(), amplitudes)
+
+def _apply_to_index_groups(
+    M: sp.Matrix,
+    table: list[list[int]],
+    amplitudes: list[sp.Expr]
+) -> list[sp.Expr]:
+    dim = M.rows
+    # nonzero entries of each row of the gate matrix: [(col, value), ...]
+    gate_rows = [
+        [(b, M[a, b]) for b in range(dim) if M[a, b] != 0]
+        for a in range(dim)
+    ]
+
+    new_amplitudes = list(amplitudes)
+    for idxs in table:
+        sub = [amplitudes[i] for i in idxs]
+        if all(v == 0 for v in sub):
+            continue
+        for i, row in zip(idxs, gate_rows):
+            new_amplitudes[i] = sp.Add(*[m * sub[b] for b, m in row if sub[b] != 0])
+    return new_amplitudes
+
+def apply_diagonal_to_amplitudes(
+    diagonal: list[sp.Expr],
+    q_idxs: list[int],
+    amplitudes: list[sp.Expr],
+    num_qubits: int
+) -> list[sp.Expr]:
+    """
+    Multiply each amplitude by the diagonal entry (2^k) of its local basis index on `q_idxs`
+    """
+    diagonal = list(diagonal)
+    return [
+        a if a == 0 or diagonal[l] == 1 else diagonal[l] * a
+        for a, l in zip(amplitudes, diagonal_index_table(num_qubits, tuple(q_idxs)).tolist())
+    ]
+
+def apply_permutation_to_amplitudes(
+    perm: tuple[int, ...],
+    phases: tuple[sp.Expr, ...],
+    q_idxs: list[int],
+    amplitudes: list[sp.Expr],
+    num_qubits: int
+) -> list[sp.Expr]:
+    """
+    Apply a monomial (2^k x 2^k) matrix, M[a, perm[a]] = phases[a], as a gather of amplitudes times phases
+    """
+    source = permutation_index_table(num_qubits, tuple(q_idxs), tuple(perm)).tolist()
+    local = diagonal_index_table(num_qubits, tuple(q_idxs)).tolist()
+    new_amplitudes = []
+    for src, l in zip(source, local):
+        a = amplitudes[src]
+        new_amplitudes.append(a if a == 0 or phases[l] == 1 else phases[l] * a)
+    return new_amplitudes
+
+def layer_diagonal(gates: list[StandardGate], num_qubits: int) -> list[sp.Expr]:
+    """
+    Diagonal (2^n) of the product of diagonal gates on the full state
+    """
+    diagonal = [sp.Integer(1)] * 2 ** num_qubits
+    for gate in gates:
+        diagonal = apply_diagonal_to_amplitudes(gate.sym_matrix.diagonal(), gate.q_idxs, diagonal, num_qubits)
+    return diagonal
+
+def scale_rows(U: sp.SparseMatrix, diagonal: list[sp.Expr]) -> sp.SparseMatrix:
+    """
+    diag(diagonal) * U, computed on the nonzero entries of U only
+    """
+    return sp.SparseMatrix(U.rows, U.cols, {
+        (i, j): v if diagonal[i] == 1 else diagonal[i] * v
+        for (i, j), v in U.todok().items()
+    })
+
+def permute_rows(
+    U: sp.SparseMatrix,
+    perm: tuple[int, ...],
+    phases: tuple[sp.Expr, ...],
+    q_idxs: list[int],
+    num_qubits: int
+) -> sp.SparseMatrix:
+    """
+    M * U for a monomial gate M on `q_idxs`, computed by moving the nonzero entries of U between rows
+    """
+    source = permutation_index_table(num_qubits, tuple(q_idxs), tuple(perm)).tolist()
+    local = diagonal_index_table(num_qubits, tuple(q_idxs)).tolist()
+    target = {src: i for i, src in enumerate(source)}
+    return sp.SparseMatrix(U.rows, U.cols, {
+        (target[i], j): v if phases[local[target[i]]] == 1 else phases[local[target[i]]] * v
+        for (i, j), v in U.todok().items()
+    })
+
+def multiply_monomial(P: sp.SparseMatrix, U: sp.SparseMatrix) -> sp.SparseMatrix:
+    """
+    P * U for a monomial P (one nonzero per row), computed by gathering the rows of U
+    """
+    rows: dict[int, list[tuple[int, sp.Expr]]] = {}
+    for (i, j), v in U.todok().items():
+        rows.setdefault(i, []).append((j, v))
+    return sp.SparseMatrix(U.rows, U.cols, {
+        (i, j): v if phase == 1 else phase * v
+        for (i, src), phase in P.todok().items()
+        for j, v in rows.get(src, ())
+    })
+
+def matrix_power(U: sp.SparseMatrix, k: int, monomial: bool = False) -> sp.SparseMatrix:
+    """
+    U ** k (k >= 1) by repeated squaring, O(log k) sparse products instead of k - 1
+
+    If `monomial`, U has one nonzero per row and the products gather rows (see `multiply_monomial`).
+    """
+    multiply = multiply_monomial if monomial else (lambda A, B: A * B)
+    result = None
+    while k:
+        if k & 1:
+            # powers of U commute, the order of the factors doesn't matter
+            result = U if result is None else multiply(U, result)
+        k >>= 1
+        if k:
+            U = multiply(U, U)
+    return result
+
+def combine_rows(
+    M: sp.Matrix,
+    ctrl_qidxs: list[int],
+    ctrl_state: int,
+    target_qidxs: list[int],
+    U: sp.SparseMatrix,
+    num_qubits: int
+) -> sp.SparseMatrix:
+    """
+    G * U for a controlled gate G, only the rows of U where the controls are in `ctrl_state` are recombined
+    """
+    rows: dict[int, dict[int, sp.Expr]] = {}
+    for (i, j), v in U.todok().items():
+        rows.setdefault(i, {})[j] = v
+
+    dim = M.rows
+    gate_rows = [[(b, M[a, b]) for b in range(dim) if M[a, b] != 0] for a in range(dim)]
+    new_rows = dict(rows)
+    for idxs in controlled_index_table(num_qubits, tuple(ctrl_qidxs), ctrl_state, tuple(target_qidxs)).tolist():
+        sub = [rows.get(i, {}) for i in idxs]
+        for i, row in zip(idxs, gate_rows):
+            new_row: dict[int, list[sp.Expr]] = {}
+            for b, m in row:
+                for j, v in sub[b].items():
+                    new_row.setdefault(j, []).append(m * v)
+            new_rows[i] = {j: sp.Add(*terms) for j, terms in new_row.items()}
+
+    return sp.SparseMatrix(U.rows, U.cols, {
+        (i, j): v for i, row in new_rows.items() for j, v in row.items() if v != 0
+    })
+
+def apply_layer_to_matrix(
+    layer: StandardGateLayer,
+    U: sp.SparseMatrix,
+    num_qubits: int
+) -> sp.SparseMatrix:
+    """
+    Left-multiply U (2^n x 2^n) by the layer unitary
+
+    Gates of a layer act on disjoint qubits and commute: dense gates are multiplied as one layer matrix,
+    controlled gates recombine the rows where their controls are set, monomial gates move rows and
+    diagonal gates scale rows, without full symbolic matrix products.
+    """
+    dense_ops = [op for op in layer.ops if not (op.is_diagonal or op.is_monomial or op.control)]
+    if dense_ops:
+        U = construct_layer_matrix(StandardGateLayer(dense_ops), num_qubits) * U
+    for op in layer.ops:
+        if op.is_monomial:
+            U = permute_rows(U, *op.permutation, op.q_idxs, num_qubits)
+        elif not op.is_diagonal and op.control:
+            ctrl_qidxs, ctrl_state, target = op.control
+            U = combine_rows(target, ctrl_qidxs, ctrl_state, op.q_idxs[len(ctrl_qidxs):], U, num_qubits)
+    diagonal_ops = [op for op in layer.ops if op.is_diagonal]
+    if diagonal_ops:
+        U = scale_rows(U, layer_diagonal(diagonal_ops, num_qubits))
+    return U
+
+def apply_layer_to_state(
+    layer: StandardGateLayer,
+    state: sp.Matrix,
+    num_qubits: int
+) -> sp.Matrix:
+    """
+    Apply every gate of a StandardGateLayer to a statevector (2^n, 1)
+    """
+    amplitudes = list(state)
+    for op in layer.ops:
+        amplitudes = apply_gate_to_amplitudes(op, amplitudes, num_qubits)
+    return sp.Matrix(amplitudes)
+
+def apply_gate_to_density(
+    gate: StandardGate,
+    entries: list[sp.Expr],
+    num_qubits: int
+) -> list[sp.Expr]:
+    """
+    Apply a StandardGate to a density matrix, rho -> U rho U^†
+
+    Parameters
+    ----------
+    gate : StandardGate
+    entries : list[sp.Expr]
+        row-major density matrix entries (4^n), seen as a 2n-qubit vector where
+        qubit q of the row index is bit q+n and qubit q of the column index is bit q
+    num_qubits : int
+
+    Returns
+    -------
+    new_entries : list[sp.Expr]
+        U acts on the row qubits and conj(U) on the column qubits
+
+    """
+    M = gate.sym_matrix
+    row_qidxs = [q + num_qubits for q in gate.q_idxs]
+    if gate.is_diagonal:
+        entries = apply_diagonal_to_amplitudes(M.diagonal(), row_qidxs, entries, 2 * num_qubits)
+        return apply_diagonal_to_amplitudes(M.diagonal().conjugate(), gate.q_idxs, entries, 2 * num_qubits)
+    if gate.is_monomial:
+        perm, phases = gate.permutation
+        entries = apply_permutation_to_amplitudes(perm, phases, row_qidxs, entries, 2 * num_qubits)
+        conj_phases = tuple(sp.conjugate(p) for p in phases)
+        return apply_permutation_to_amplitudes(perm, conj_phases, gate.q_idxs, entries, 2 * num_qubits)
+    if gate.control:
+        ctrl_qidxs, ctrl_state, target = gate.control
+        target_qidxs = gate.q_idxs[len(ctrl_qidxs):]
+        entries = apply_controlled_to_amplitudes(
+            target, [q + num_qubits for q in ctrl_qidxs], ctrl_state, [q + num_qubits for q in target_qidxs],
+            entries, 2 * num_qubits
+        )
+        return apply_controlled_to_amplitudes(
+            target.conjugate(), ctrl_qidxs, ctrl_state, target_qidxs, entries, 2 * num_qubits
+        )
+    entries = apply_matrix_to_amplitudes(M, row_qidxs, entries, 2 * num_qubits)
+    return apply_matrix_to_amplitudes(M.conjugate(), gate.q_idxs, entries, 2 * num_qubits)
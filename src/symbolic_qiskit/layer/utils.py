@@ -1,33 +1,199 @@
+from functools import lru_cache
 from typing import Literal, Tuple
 
 import sympy as sp
 import numpy as np
 
-def permute_qubit_unitary(U_p: sp.Matrix, perm: list[int]) -> sp.Matrix:
+@lru_cache(maxsize=None)
+def gate_index_table(num_qubits: int, q_idxs: tuple[int, ...]) -> np.ndarray:
     """
     Args:
-        U (sp.Matrix): matrix on qubits U (2^n x 2^n)
+        num_qubits (int): number of qubits n of the full state
+        q_idxs (tuple[int, ...]): qubits the gate acts on, q_idxs[0] is the most significant bit of the gate matrix
+
+    Returns:
+        np.ndarray: read-only table (2^(n-k), 2^k), row r holds the state indices coupled by the gate,
+            ordered by the gate's local basis index
+    """
+    k = len(q_idxs)
+    idx = np.arange(2 ** num_qubits, dtype=np.int64)
+    mask = sum(1 << q for q in q_idxs)
+    base = idx[(idx & mask) == 0]
+
+    local = np.arange(2 ** k, dtype=np.int64)
+    offsets = np.zeros(2 ** k, dtype=np.int64)
+    for j, q in enumerate(q_idxs):
+        offsets |= ((local >> (k - 1 - j)) & 1) << q
+
+    table = base[:, None] | offsets[None, :]
+    table.flags.writeable = False
+    return table
+
+@lru_cache(maxsize=None)
+def controlled_index_table(
+    num_qubits: int,
+    ctrl_qidxs: tuple[int, ...],
+    ctrl_state: int,
+    target_qidxs: tuple[int, ...]
+) -> np.ndarray:
+    """
+    Returns:
+        np.ndarray: read-only table (2^(n-c-t), 2^t), rows of `gate_index_table` restricted to the state indices
+            where the control qubits are in `ctrl_state` (ctrl_qidxs[0] most significant)
+    """
+    dim = 2 ** len(target_qidxs)
+    table = gate_index_table(num_qubits, ctrl_qidxs + target_qidxs)[:, ctrl_state * dim:(ctrl_state + 1) * dim].copy()
+    table.flags.writeable = False
+    return table
+
+@lru_cache(maxsize=None)
+def diagonal_index_table(num_qubits: int, q_idxs: tuple[int, ...]) -> np.ndarray:
+    """
+    Args:
+        num_qubits (int): number of qubits n of the full state
+        q_idxs (tuple[int, ...]): qubits the gate acts on, q_idxs[0] is the most significant bit of the gate matrix
+
+    Returns:
+        np.ndarray: read-only array (2^n,), entry i is the gate's local basis index of state index i
+    """
+    k = len(q_idxs)
+    idx = np.arange(2 ** num_qubits, dtype=np.int64)
+    local = np.zeros(2 ** num_qubits, dtype=np.int64)
+    for j, q in enumerate(q_idxs):
+        local |= ((idx >> q) & 1) << (k - 1 - j)
+    local.flags.writeable = False
+    return local
+
+@lru_cache(maxsize=None)
+def permutation_index_table(num_qubits: int, q_idxs: tuple[int, ...], perm: tuple[int, ...]) -> np.ndarray:
+    """
+    Args:
+        num_qubits (int): number of qubits n of the full state
+        q_idxs (tuple[int, ...]): qubits the gate acts on, q_idxs[0] is the most significant bit of the gate matrix
+        perm (tuple[int, ...]): column of the nonzero entry in each row of the (monomial) gate matrix
+
+    Returns:
+        np.ndarray: read-only gather table (2^n,), entry i is the state index whose amplitude lands on index i
+    """
+    k = len(q_idxs)
+    idx = np.arange(2 ** num_qubits, dtype=np.int64)
+    mask = sum(1 << q for q in q_idxs)
+
+    local = np.arange(2 ** k, dtype=np.int64)
+    offsets = np.zeros(2 ** k, dtype=np.int64)
+    for j, q in enumerate(q_idxs):
+        offsets |= ((local >> (k - 1 - j)) & 1) << q
+
+    source = (idx & ~mask) | offsets[np.asarray(perm, dtype=np.int64)[diagonal_index_table(num_qubits, q_idxs)]]
+    source.flags.writeable = False
+    return source
+
+@lru_cache(maxsize=None)
+def qubit_permutation_index_map(num_qubits: int, perm: tuple[int, ...]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Args:
+        num_qubits (int): number of qubits n
+        perm (tuple[int, ...]): permutation (n), maps qubit i to perm[i]
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: read-only (index_map, inverse_map) of the basis states (2^n),
+            bit (n-1-j) of index_map[i] is bit (n-1-perm.index(j)) of i
+    """
+    n = num_qubits
+    inverse_perm = np.argsort(perm)
+    idx = np.arange(2 ** n, dtype=np.int64)
+
+    index_map = np.zeros(2 ** n, dtype=np.int64)
+    for j in range(n):
+        index_map |= ((idx >> (n - 1 - inverse_perm[j])) & 1) << (n - 1 - j)
+
+    inverse_map = np.empty_like(index_map)
+    inverse_map[index_map] = idx
+
+    index_map.flags.writeable = False
+    inverse_map.flags.writeable = False
+    return index_map, inverse_map
+
+@lru_cache(maxsize=None)
+def projection_mask(num_qubits: int, q_idx: int, outcome: Literal[0, 1]) -> tuple[bool, ...]:
+    """
+    Returns:
+        tuple[bool, ...]: (2^n) whether basis state i has qubit q_idx (little-endian) equal to outcome
+    """
+    idx = np.arange(2 ** num_qubits, dtype=np.int64)
+    return tuple((((idx >> q_idx) & 1) == outcome).tolist())
+
+@lru_cache(maxsize=None)
+def density_projection_mask(num_qubits: int, q_idx: int, outcome: Literal[0, 1] | None) -> tuple[bool, ...]:
+    """
+    Args:
+        num_qubits (int): number of qubits n of the density matrix
+        q_idx (int): measured qubit (little-endian)
+        outcome (Literal[0, 1] | None): measurement outcome, None for both outcomes (dephasing)
+
+    Returns:
+        tuple[bool, ...]: (4^n) whether the row-major density matrix entry (i, j) is kept by the projection,
+            i.e. bit q_idx of i and of j both equal `outcome` (or each other if None)
+    """
+    idx = np.arange(4 ** num_qubits, dtype=np.int64)
+    row_bit = (idx >> (q_idx + num_qubits)) & 1
+    col_bit = (idx >> q_idx) & 1
+    keep = row_bit == col_bit
+    if outcome is not None:
+        keep &= row_bit == outcome
+    return tuple(keep.tolist())
+
+@lru_cache(maxsize=None)
+def density_reset_index_pairs(num_qubits: int, q_idx: int) -> tuple[tuple[int, int, int], ...]:
+    """
+    Returns:
+        tuple[tuple[int, int, int], ...]: (target, source_0, source_1) row-major density matrix indices,
+            resetting qubit q_idx sets entry `target` (qubit in |0><0|) to the sum of the two sources
+            (the same entry with the qubit in |0><0| and in |1><1|), every other entry becomes zero
+    """
+    idx = np.arange(4 ** num_qubits, dtype=np.int64)
+    flip = (1 << q_idx) | (1 << (q_idx + num_qubits))
+    target = idx[(idx & flip) == 0]
+    return tuple(zip(target.tolist(), target.tolist(), (target | flip).tolist()))
+
+def sparse_kronecker_product(*matrices: sp.Matrix) -> sp.SparseMatrix:
+    """
+    Kronecker product that only visits nonzero entries, kron(A, B, ...) = A ⓧ B ⓧ ...
+
+    Returns:
+        sp.SparseMatrix: dict-of-keys matrix, entries scale with the product of nonzeros
+    """
+    rows, cols = 1, 1
+    dok: dict[tuple[int, int], sp.Expr] = {(0, 0): sp.S.One}
+    for M in matrices:
+        m_dok = M.todok()
+        dok = {
+            (r * M.rows + mr, c * M.cols + mc): v * mv
+            for (r, c), v in dok.items()
+            for (mr, mc), mv in m_dok.items()
+        }
+        rows, cols = rows * M.rows, cols * M.cols
+    return sp.SparseMatrix(rows, cols, dok)
+
+def permute_qubit_unitary(U_p: sp.Matrix, perm: list[int]) -> sp.SparseMatrix:
+    """
+    Args:
+        U (sp.Matrix): matrix on qubits U (2^n x 2^n), dense or sparse
         perm (list[int]): permutation list (n), maps qubit i to perm[i]
 
     Returns:
-        U_p (sp.Matrix): matrix on permuted qubits, U_p = P.T * U * P
+        U_p (sp.SparseMatrix): matrix on permuted qubits, U_p = P.T * U * P
     """
     n = len(perm)
     dim = 2 ** n
+    _, inverse_map = qubit_permutation_index_map(n, tuple(perm))
+    inverse_map = inverse_map.tolist()
 
-    index_map = np.empty(dim, dtype=int)
-
-    for i in range(dim):
-        
-        bitstr = format(i, f"0{n}b")
-        reordered_bits = [bitstr[perm.index(j)] for j in range(n)] 
-        idx = int("".join(reordered_bits), 2)
-        index_map[i] = idx
-        #print(i, bitstr, reordered_bits, idx)
-
-    U_np = np.array(U_p, dtype=object)
-    U_perm_np = U_np[np.ix_(index_map, index_map)]
-    return sp.Matrix(U_perm_np)
+    # U_perm[a, b] = U_p[index_map[a], index_map[b]], only move the nonzero entries
+    return sp.SparseMatrix(dim, dim, {
+        (inverse_map[r], inverse_map[c]): v
+        for (r, c), v in U_p.todok().items()
+    })
 
 def state_vector_projection(state_vector: sp.Matrix, q_idx: int, collapsed_state: Literal[0,1]) -> Tuple[sp.Expr,sp.Matrix]:
     """
@@ -46,15 +212,10 @@ def state_vector_projection(state_vector: sp.Matrix, q_idx: int, collapsed_state
     if not (0 <= q_idx < n_qubits):
         raise ValueError(f"Invalid qubit index: {q_idx}. Expected range 0 to {n_qubits - 1}.")
     
-    indices = []
-    for i in range(dim):
-        bitstr = format(i, f"0{n_qubits}b")
-        if int(bitstr[n_qubits - 1 - q_idx]) == collapsed_state:
-            indices.append(i)
-
+    mask = projection_mask(n_qubits, q_idx, collapsed_state)
     projected = sp.Matrix([
-        state_vector[i] if i in indices else 0
-        for i in range(dim)
+        amp if keep else 0
+        for amp, keep in zip(state_vector, mask)
     ])
     prob = (projected.H * projected)[0]
     normalized = projected if prob == 0 else projected / projected.norm()
@@ -0,0 +1,56 @@
+import pytest
+from hypothesis import given, strategies, settings
+
+import numpy as np
+import sympy as sp
+import qiskit.quantum_info as qi
+from qiskit import QuantumCircuit
+
+from symbolic_qiskit import CircuitInspector
+from tests.utils.random import random_unitary_circuit
+
+MEASURE = qi.Kraus([np.diag([1, 0]), np.diag([0, 1])])
+RESET = qi.Kraus([np.array([[1, 0], [0, 0]]), np.array([[0, 1], [0, 0]])])
+
+def reference_density_matrix(qc: QuantumCircuit) -> np.ndarray:
+    rho = qi.DensityMatrix.from_int(0, 2 ** qc.num_qubits)
+    for ins in qc.data:
+        qargs = [qc.find_bit(q).index for q in ins.qubits]
+        name = ins.operation.name
+        if name == 'barrier':
+            continue
+        channel = MEASURE if name == 'measure' else RESET if name == 'reset' else qi.Operator(ins.operation)
+        rho = rho.evolve(channel, qargs=qargs)
+    return rho.data
+
+@given(num_qubits=strategies.integers(min_value=1, max_value=3),
+       seed=strategies.integers(min_value=0))
+@settings(deadline=None, max_examples=5)
+def test_density_circuit(num_qubits, seed):
+    pqc = random_unitary_circuit(num_qubits=num_qubits, depth=2, seed=seed)
+    qc = QuantumCircuit(num_qubits, num_qubits)
+    qc.compose(pqc, inplace=True)
+    qc.measure(0, 0)
+    qc.reset(num_qubits - 1)
+    qc.compose(pqc, inplace=True)
+    qc.measure(range(num_qubits), range(num_qubits))
+
+    values = np.random.rand(qc.num_parameters) * 2*np.pi
+    rho_qiskit = reference_density_matrix(qc.assign_parameters(dict(zip(qc.parameters, values))))
+
+    inspector = CircuitInspector(qc, mode='density')
+    rho_symb = inspector.sweep(values[None, :], outputs=['density_matrix'])[('density_matrix', None)]
+    assert np.allclose(rho_qiskit.ravel(), rho_symb[0])
+
+    conditional = CircuitInspector(qc, mode='density', condition_on_clbits=True).conditional_density_matrices()
+    assert all(len(key) == num_qubits for key in conditional)
+    total = sum(conditional.values(), sp.zeros(2 ** num_qubits, 2 ** num_qubits))
+    assert sp.simplify(total - inspector.density_matrix()) == sp.zeros(2 ** num_qubits, 2 ** num_qubits)
+
+def test_reset_requires_density_mode():
+    qc = QuantumCircuit(1)
+    qc.h(0)
+    qc.reset(0)
+    with pytest.raises(ValueError):
+        CircuitInspector(qc)
+    assert CircuitInspector(qc, mode='density').density_matrix() == sp.Matrix([[1, 0], [0, 0]])
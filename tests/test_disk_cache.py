@@ -0,0 +1,42 @@
+import sympy as sp
+from qiskit import QuantumCircuit
+from qiskit.circuit import Parameter
+
+from symbolic_qiskit import CircuitInspector
+from symbolic_qiskit.circuit.disk_cache import DiskCache
+
+def _circuit() -> QuantumCircuit:
+    theta = Parameter('theta')
+    qc = QuantumCircuit(2)
+    qc.h(0)
+    qc.ry(theta, 1)
+    qc.barrier(label='mid')
+    qc.cx(0, 1)
+    return qc
+
+def test_warm_inspector_skips_evolution(tmp_path, monkeypatch):
+    cold = CircuitInspector(_circuit(), cache_dir=tmp_path)
+    expected = cold.statevector(simplify=True)
+    mid = cold.statevector('mid')
+    assert len(list(tmp_path.glob('*.pkl.z'))) == 1
+
+    warm = CircuitInspector(_circuit(), cache_dir=tmp_path)
+    def fail(*args, **kwargs):
+        raise AssertionError("warm run should not evolve or simplify")
+    monkeypatch.setattr(warm.backend, '_apply_chunk', fail)
+    monkeypatch.setattr(warm.backend, '_simplify_state', fail)
+    assert sp.simplify(warm.statevector(simplify=True) - expected) == sp.zeros(4, 1)
+    assert sp.simplify(warm.statevector('mid') - mid) == sp.zeros(4, 1)
+
+def test_cache_key_depends_on_options(tmp_path):
+    CircuitInspector(_circuit(), cache_dir=tmp_path).statevector()
+    CircuitInspector(_circuit(), cache_dir=tmp_path, simplify_strategy='trigsimp').statevector()
+    assert len(list(tmp_path.glob('*.pkl.z'))) == 2
+
+def test_eviction_respects_max_bytes(tmp_path):
+    cache = DiskCache(tmp_path, max_bytes=1)
+    cache.save('a', {'x': 1})
+    cache.save('b', {'x': 2})
+    assert [p.name for p in tmp_path.glob('*.pkl.z')] == ['b.pkl.z']
+    assert cache.load('a') is None
+    assert cache.load('b') == {'x': 2}
@@ -0,0 +1,24 @@
+import sympy as sp
+from qiskit.circuit import Parameter
+from qiskit.circuit.library import HGate, RYGate
+
+from symbolic_qiskit.gate import gate_to_sympy_matrix, gate_matrix_cache_info, clear_gate_matrix_cache
+
+def test_gate_matrix_cache():
+    clear_gate_matrix_cache()
+    theta = Parameter('theta')
+
+    first = gate_to_sympy_matrix(RYGate(theta))
+    again = gate_to_sympy_matrix(RYGate(theta))
+    gate_to_sympy_matrix(HGate())
+    gate_to_sympy_matrix(HGate())
+
+    assert first is again
+    assert isinstance(first, sp.ImmutableMatrix)
+    info = gate_matrix_cache_info()
+    assert (info.hits, info.misses, info.currsize) == (2, 2, 2)
+
+def test_gate_matrix_cache_distinguishes_params():
+    clear_gate_matrix_cache()
+    assert gate_to_sympy_matrix(RYGate(0.1)) != gate_to_sympy_matrix(RYGate(0.2))
+    assert gate_matrix_cache_info().misses == 2
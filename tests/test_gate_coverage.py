@@ -1,8 +1,34 @@
+import numpy as np
+from qiskit.quantum_info import Operator
 from qiskit.circuit.library import get_standard_gate_name_mapping
-from symbolic_qiskit.gate.standard_gates import SUPPORTED_GATES
+from symbolic_qiskit.gate.standard_gates import SUPPORTED_GATES, FULL_GATE_REGISTRY
 
 def test_gate_coverage():
     qiskit_gates = set(get_standard_gate_name_mapping().keys())
     expected_qiskit_gates = qiskit_gates - {'delay','reset','measure','global_phase'}
     missing = expected_qiskit_gates - SUPPORTED_GATES
-    assert not missing, f"Missing symbolic implementations for: {sorted(missing)}"
\ No newline at end of file
+    assert not missing, f"Missing symbolic implementations for: {sorted(missing)}"
+
+def test_diagonal_gates():
+    qiskit_gates = get_standard_gate_name_mapping()
+    for name, gate_class in FULL_GATE_REGISTRY.items():
+        if name not in qiskit_gates:
+            continue
+        op = qiskit_gates[name]
+        matrix = Operator(op.base_class(*[0.3] * len(op.params))).data
+        diagonal = np.allclose(matrix, np.diag(np.diag(matrix)))
+        monomial = all(np.count_nonzero(~np.isclose(row, 0)) == 1 for row in matrix)
+        assert gate_class.diagonal == diagonal, name
+        assert gate_class.monomial == (monomial and not diagonal), name
+
+def test_controlled_gates():
+    qiskit_gates = get_standard_gate_name_mapping()
+    for name, gate_class in FULL_GATE_REGISTRY.items():
+        if not gate_class.num_ctrl_qubits or name not in qiskit_gates:
+            continue
+        assert qiskit_gates[name].num_ctrl_qubits == gate_class.num_ctrl_qubits, name
+        op = qiskit_gates[name]
+        matrix = Operator(op.base_class(*[0.3] * len(op.params))).reverse_qargs().data
+        offset = len(matrix) - len(matrix) // 2 ** gate_class.num_ctrl_qubits
+        assert np.allclose(matrix[:offset, :offset], np.eye(offset)), name
+        assert np.allclose(matrix[:offset, offset:], 0) and np.allclose(matrix[offset:, :offset], 0), name
@@ -44,4 +44,53 @@ def _evaluate_symbolic_probabilities(expr: sp.Matrix, bindings):
             probs_data = deep_evalf(simplified_expr.subs(bindings))
             arr = np.array(probs_data, dtype=np.complex128).ravel()
     
-    return arr
\ No newline at end of file
+    return arr
+
+@given(num_qubits=strategies.integers(min_value=1, max_value=3),
+       seed=strategies.integers(min_value=0))
+@settings(deadline=None, max_examples=5)
+def test_measurement_sweep(num_qubits, seed):
+    pqc = random_unitary_circuit(
+    num_qubits=num_qubits, depth=3, seed=seed)
+
+    values = np.random.rand(4, pqc.num_parameters) * 2*np.pi
+    # qiskit
+    arr_qiskit = np.array([
+        Statevector(pqc.assign_parameters(dict(zip(pqc.parameters, row)))).probabilities()
+        for row in values
+    ])
+    # symbolic-qiskit
+    meas_idxs = list(reversed(range(num_qubits)))
+    pqc.measure(meas_idxs, meas_idxs)
+    result = CircuitInspector(pqc).sweep(values, outputs=['probabilities'], chunk_size=3)
+    assert np.allclose(arr_qiskit, result[('probabilities', None)])
+    shared = CircuitInspector(pqc, shared_subexpressions=True).sweep(values, outputs=['probabilities'])
+    assert np.allclose(arr_qiskit, shared[('probabilities', None)])
+
+
+def test_parallel_simplify():
+    pqc = random_unitary_circuit(num_qubits=2, depth=2, seed=7)
+    pqc.measure([1, 0], [1, 0])
+
+    serial = CircuitInspector(pqc)
+    parallel = CircuitInspector(pqc, workers=2)
+    parallel.simplify()
+    for b_serial, b_parallel in zip(serial.branches(simplify=True), parallel.branches()):
+        assert b_serial.measured_bits == b_parallel.measured_bits
+        assert b_serial.prob == b_parallel.prob
+        assert b_serial.state == b_parallel.state
+
+def test_parallel_branch_evolution():
+    pqc = random_unitary_circuit(num_qubits=2, depth=2, seed=11)
+    qc = pqc.copy()
+    qc.measure_all()
+    qc.barrier(label='mid')
+    qc.compose(pqc, inplace=True)
+    qc.measure_all(add_bits=False)
+
+    serial = CircuitInspector(qc).branches()
+    parallel = CircuitInspector(qc, workers=2).branches()
+    assert [b.measured_bits for b in serial] == [b.measured_bits for b in parallel]
+    for b_serial, b_parallel in zip(serial, parallel):
+        assert b_serial.prob == b_parallel.prob
+        assert b_serial.state == b_parallel.state
@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+import sympy as sp
+
+from symbolic_qiskit import CircuitInspector
+from tests.utils.random import random_unitary_circuit
+from tests.utils.param import generate_parameter_bindings
+
+def _evaluate(expr: sp.Matrix, bindings) -> np.ndarray:
+    return np.array(expr.subs(bindings).evalf(), dtype=np.complex128).ravel()
+
+@pytest.mark.parametrize("strategy", ["trigsimp", "cancel", "expand_complex", "half_angle", sp.expand])
+def test_simplify_strategy(strategy):
+    pqc = random_unitary_circuit(num_qubits=2, depth=2, seed=3)
+    _, sp_binding = generate_parameter_bindings(pqc)
+
+    inspector = CircuitInspector(pqc)
+    raw = _evaluate(inspector.statevector(), sp_binding)
+    simplified = _evaluate(inspector.statevector(simplify=strategy), sp_binding)
+    assert np.allclose(raw, simplified)
+    # the unsimplified state is still cached alongside
+    assert np.allclose(raw, _evaluate(inspector.statevector(), sp_binding))
+
+def test_simplify_timeout_falls_back():
+    pqc = random_unitary_circuit(num_qubits=2, depth=3, seed=5)
+    inspector = CircuitInspector(pqc, simplify_timeout=1e-6)
+    assert inspector.statevector(simplify=True) == inspector.statevector()
+
+def test_invalid_strategy():
+    pqc = random_unitary_circuit(num_qubits=1, depth=1, seed=0)
+    with pytest.raises(ValueError):
+        CircuitInspector(pqc, simplify_strategy="nope")
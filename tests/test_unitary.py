@@ -1,9 +1,15 @@
+import pytest
 from hypothesis import given, strategies, settings
 
 import numpy as np
-from qiskit.quantum_info import Statevector
+import sympy as sp
+from qiskit.quantum_info import Statevector, Operator
+from qiskit import QuantumCircuit
+from qiskit.circuit import Parameter, ParameterVector
 
 from symbolic_qiskit import CircuitInspector
+from symbolic_qiskit.circuit import circuit_to_chunks
+from symbolic_qiskit.circuit.base import StandardGateChunk
 from tests.utils.random import random_unitary_circuit
 from tests.utils.param import generate_parameter_bindings
 
@@ -23,4 +29,288 @@ def test_unitary_circuit(num_qubits, seed):
     arr_symb = np.array(final_state_data, dtype=np.complex128).ravel()
     assert np.allclose(arr_qiskit, arr_symb)
 
+@given(num_qubits=strategies.integers(min_value=1, max_value=3),
+       seed=strategies.integers(min_value=0))
+@settings(deadline=None, max_examples=10)
+def test_unitary_matrix(num_qubits, seed):
+    pqc = random_unitary_circuit(
+    num_qubits=num_qubits, depth=3, seed=seed)
+
+    qc_binding, sp_binding = generate_parameter_bindings(pqc)
+    # qiskit
+    arr_qiskit = Operator(pqc.assign_parameters(qc_binding)).data
+    # symbolic-qiskit
+    U = CircuitInspector(pqc).unitary()
+    arr_symb = np.array(U.subs(sp_binding).evalf(), dtype=np.complex128)
+    assert np.allclose(arr_qiskit, arr_symb)
+
+@given(num_qubits=strategies.integers(min_value=1, max_value=3),
+       seed=strategies.integers(min_value=0))
+@settings(deadline=None, max_examples=10)
+def test_barrier_statevector(num_qubits, seed):
+    full = random_unitary_circuit(num_qubits=num_qubits, depth=4, seed=seed)
+    mid = len(full.data) // 2
+    first = full.copy_empty_like()
+    pqc = full.copy_empty_like()
+    for ins in full.data[:mid]:
+        first.append(ins)
+        pqc.append(ins)
+    pqc.barrier(label='mid')
+    for ins in full.data[mid:]:
+        pqc.append(ins)
+
+    qc_binding, sp_binding = generate_parameter_bindings(pqc)
+    arr_qiskit = Statevector(first.assign_parameters(
+        {p: v for p, v in qc_binding.items() if p in first.parameters})).data
+
+    lazy = CircuitInspector(pqc)
+    eager = CircuitInspector(pqc)
+    eager.precompute()
+    for inspector in (lazy, eager):
+        state = inspector.statevector('mid').subs(sp_binding).evalf()
+        assert np.allclose(arr_qiskit, np.array(state, dtype=np.complex128).ravel())
+
+@given(num_qubits=strategies.integers(min_value=1, max_value=3),
+       seed=strategies.integers(min_value=0))
+@settings(deadline=None, max_examples=10)
+def test_compiled_statevector(num_qubits, seed):
+    pqc = random_unitary_circuit(
+    num_qubits=num_qubits, depth=3, seed=seed)
+
+    values = np.random.rand(4, pqc.num_parameters) * 2*np.pi
+    # qiskit
+    arr_qiskit = np.array([
+        Statevector(pqc.assign_parameters(dict(zip(pqc.parameters, row)))).data
+        for row in values
+    ])
+    # symbolic-qiskit
+    arr_symb = CircuitInspector(pqc).compile('statevector')(values)
+    assert arr_symb.dtype == np.complex128
+    assert np.allclose(arr_qiskit, arr_symb)
+
+@given(num_qubits=strategies.integers(min_value=1, max_value=3),
+       seed=strategies.integers(min_value=0))
+@settings(deadline=None, max_examples=10)
+def test_shared_subexpressions(num_qubits, seed):
+    pqc = random_unitary_circuit(
+    num_qubits=num_qubits, depth=3, seed=seed)
+
+    values = np.random.rand(4, pqc.num_parameters) * 2*np.pi
+    plain = CircuitInspector(pqc)
+    shared = CircuitInspector(pqc, shared_subexpressions=True)
+    assert shared.statevector() == shared.shared_state().expand()
+    assert np.allclose(plain.compile('statevector')(values), shared.compile('statevector')(values))
+    assert np.allclose(plain.compile('probabilities')(values), shared.compile('probabilities')(values))
+
+def test_checkpointed_snapshots():
+    full = random_unitary_circuit(num_qubits=2, depth=6, seed=5)
+    pqc = full.copy_empty_like()
+    for i, ins in enumerate(full.data):
+        pqc.append(ins)
+        pqc.barrier(label=f'b{i}')
+
+    labels = [f'b{i}' for i in range(len(full.data))]
+    reference = CircuitInspector(pqc)
+    checkpointed = CircuitInspector(pqc, checkpoint_every=3, snapshot_cache_size=1)
+    for label in labels[::-1] + labels:
+        assert checkpointed.statevector(label) == reference.statevector(label)
+
+    backend = checkpointed.backend
+    stored = [p for p in backend.snapshots if 0 < p < len(backend.chunks)]
+    assert len(stored) <= len(labels[::3]) + 1
+
+@given(num_qubits=strategies.integers(min_value=1, max_value=3),
+       seed=strategies.integers(min_value=0))
+@settings(deadline=None, max_examples=10)
+def test_extend(num_qubits, seed):
+    full = random_unitary_circuit(num_qubits=num_qubits, depth=4, seed=seed)
+    mid = len(full.data) // 2
+    prefix, suffix = full.copy_empty_like(), full.copy_empty_like()
+    for ins in full.data[:mid]:
+        prefix.append(ins)
+    suffix.barrier(label='appended')
+    for ins in full.data[mid:]:
+        suffix.append(ins)
+    full.global_phase, prefix.global_phase, suffix.global_phase = 0.3, 0.1, 0.2
+
+    inspector = CircuitInspector(prefix)
+    before = inspector.statevector()
+    inspector.extend(suffix)
+    assert inspector.parameters == list(full.parameters)
+
+    qc_binding, sp_binding = generate_parameter_bindings(full)
+    arr_qiskit = Statevector(full.assign_parameters(qc_binding)).data
+    state = inspector.statevector().subs(sp_binding).evalf()
+    assert np.allclose(arr_qiskit, np.array(state, dtype=np.complex128).ravel())
+
+    appended = inspector.statevector('appended').subs(sp_binding).evalf()
+    expected = (before * np.exp(0.2j)).subs(sp_binding).evalf()
+    assert np.allclose(np.array(appended, dtype=np.complex128), np.array(expected, dtype=np.complex128))
+
+    duplicate = full.copy_empty_like()
+    duplicate.barrier(label='appended')
+    num_chunks = len(inspector.backend.chunks)
+    with pytest.raises(ValueError):
+        inspector.extend(duplicate)
+    assert len(inspector.backend.chunks) == num_chunks
+
+@given(num_qubits=strategies.integers(min_value=1, max_value=3),
+       fusion_width=strategies.integers(min_value=1, max_value=3),
+       seed=strategies.integers(min_value=0))
+@settings(deadline=None, max_examples=10)
+def test_fusion(num_qubits, fusion_width, seed):
+    pqc = random_unitary_circuit(num_qubits=num_qubits, depth=2, seed=seed)
+    qc = pqc.copy()
+    qc.barrier(label='middle')
+    qc.compose(pqc, inplace=True)
+
+    inspector = CircuitInspector(qc, fusion_width=fusion_width)
+    reference = CircuitInspector(qc)
+    assert len(inspector.backend.chunks) <= len(reference.backend.chunks)
+
+    qc_binding, sp_binding = generate_parameter_bindings(qc)
+    unitary_qiskit = Operator(qc.assign_parameters(qc_binding)).data
+    unitary_symb = inspector.unitary().subs(sp_binding).evalf()
+    assert np.allclose(unitary_qiskit, np.array(unitary_symb, dtype=np.complex128))
+    for label in ['middle', None]:
+        state = inspector.statevector(label).subs(sp_binding).evalf()
+        expected = reference.statevector(label).subs(sp_binding).evalf()
+        assert np.allclose(np.array(state, dtype=np.complex128), np.array(expected, dtype=np.complex128))
+
+def test_monomial_gates():
+    qc = QuantumCircuit(4)
+    qc.h(0)
+    qc.ry(Parameter('t'), 1)
+    qc.cx(0, 3)
+    qc.ccx(1, 0, 2)
+    qc.swap(3, 1)
+    qc.cswap(2, 0, 3)
+    qc.dcx(1, 2)
+    qc.iswap(0, 3)
+    qc.cy(2, 0)
+    qc.rccx(0, 1, 3)
+    qc.rcccx(3, 1, 0, 2)
+
+    inspector = CircuitInspector(qc)
+    qc_binding, sp_binding = generate_parameter_bindings(qc)
+    bound = qc.assign_parameters(qc_binding)
+    unitary_symb = inspector.unitary().subs(sp_binding).evalf()
+    assert np.allclose(Operator(bound).data, np.array(unitary_symb, dtype=np.complex128))
+    state = inspector.statevector().subs(sp_binding).evalf()
+    assert np.allclose(Statevector(bound).data, np.array(state, dtype=np.complex128).ravel())
+
+def test_constant_prefix():
+    qc = QuantumCircuit(3)
+    for _ in range(3):
+        qc.h(range(3))
+        qc.t(0)
+        qc.sx(1)
+        qc.ch(0, 2)
+        qc.cx(1, 0)
+        qc.tdg(2)
+    qc.barrier(label='prep')
+    qc.ry(Parameter('t'), 1)
+
+    inspector = CircuitInspector(qc)
+    prep = inspector.statevector('prep')
+    assert not prep.has(sp.Float) and sum(sp.count_ops(a) for a in prep) < 200
+    qc_binding, sp_binding = generate_parameter_bindings(qc)
+    bound = qc.assign_parameters(qc_binding)
+    state = inspector.statevector().subs(sp_binding).evalf()
+    assert np.allclose(Statevector(bound).data, np.array(state, dtype=np.complex128).ravel())
+    unitary_symb = inspector.unitary().subs(sp_binding).evalf()
+    assert np.allclose(Operator(bound).data, np.array(unitary_symb, dtype=np.complex128))
+
+@pytest.mark.parametrize("arithmetic", ["domain", "half_angle"])
+@given(num_qubits=strategies.integers(min_value=1, max_value=3),
+       seed=strategies.integers(min_value=0))
+@settings(deadline=None, max_examples=10)
+def test_domain_arithmetic(arithmetic, num_qubits, seed):
+    pqc = random_unitary_circuit(
+    num_qubits=num_qubits, depth=3, seed=seed)
+
+    qc_binding, sp_binding = generate_parameter_bindings(pqc)
+    bound = pqc.assign_parameters(qc_binding)
+    inspector = CircuitInspector(pqc, arithmetic=arithmetic)
+    state = np.array(inspector.statevector().subs(sp_binding).evalf(), dtype=np.complex128).ravel()
+    U = np.array(inspector.unitary().subs(sp_binding).evalf(), dtype=np.complex128)
+    assert np.allclose(Statevector(bound).data, state)
+    assert np.allclose(Operator(bound).data, U)
+
+def test_half_angle_reduction():
+    theta = Parameter('θ')
+    qc = QuantumCircuit(2)
+    qc.ry(theta, 0)
+    qc.cx(0, 1)
+    qc.cx(0, 1)
+    qc.ry(-theta, 0)
+    # cos²(θ/2) + sin²(θ/2) is reduced during the evolution, no simplification needed
+    assert CircuitInspector(qc, arithmetic="half_angle").statevector() == sp.Matrix([1, 0, 0, 0])
+
+def test_custom_gate_decomposition():
+    a, b = Parameter('a'), Parameter('b')
+    inner = QuantumCircuit(2, name='inner')
+    inner.ry(a, 0)
+    inner.cx(0, 1)
+    inner.global_phase = a / 2
+    outer = QuantumCircuit(3, name='outer')
+    outer.append(inner.to_gate(), [2, 0])
+    outer.h(1)
+    outer.global_phase = 0.4
+
+    qc = QuantumCircuit(4)
+    qc.h(range(4))
+    block = outer.to_gate()
+    qc.append(block, [3, 1, 0])
+    qc.append(block, [0, 2, 1])
+    qc.append(inner.to_gate(), [3, 1])
+    qc = qc.assign_parameters({a: 2 * b})
+
+    # qubit order inside definitions and the global phases of nested definitions are kept
+    qc_binding, sp_binding = generate_parameter_bindings(qc)
+    state = CircuitInspector(qc).statevector().subs(sp_binding).evalf()
+    expected = Statevector(qc.assign_parameters(qc_binding)).data
+    assert np.allclose(expected, np.array(state, dtype=np.complex128).ravel())
+
+def test_chunk_templates():
+    num_qubits, reps = 2, 3
+    x = ParameterVector('x', 2 * num_qubits * reps)
+    qc = QuantumCircuit(num_qubits)
+    for r in range(reps):
+        for q in range(num_qubits):
+            qc.ry(x[2 * num_qubits * r + q], q)
+            qc.rz(x[2 * num_qubits * r + num_qubits + q], q)
+        qc.cx(0, 1)
+        qc.barrier()
+
+    inspector = CircuitInspector(qc)
+    U = inspector.unitary()
+    # every repetition after the first is an instance of the same template
+    info = inspector.cache_info()['chunk_templates']
+    assert (info.hits, info.misses) == (reps - 1, 1)
+
+    qc_binding, sp_binding = generate_parameter_bindings(qc)
+    arr_symb = np.array(U.subs(sp_binding).evalf(), dtype=np.complex128)
+    assert np.allclose(Operator(qc.assign_parameters(qc_binding)).data, arr_symb)
+
+@pytest.mark.parametrize("reps, barrier", [(12, False), (4, True)])
+def test_repeated_blocks(reps, barrier):
+    t = Parameter('t')
+    step = QuantumCircuit(2)
+    step.rzz(t, 0, 1)
+    step.rx(t, 0)
+    step.h(1)
+    if barrier:
+        step.barrier()
+    qc = step.repeat(reps)
+
+    # the steps are folded into one chunk, its matrix is a power of the step matrix
+    gate_chunks = [c for c in circuit_to_chunks(qc).chunks if isinstance(c, StandardGateChunk)]
+    assert [c.repeat for c in gate_chunks] == [reps]
 
+    # the symbolic power is too large for `.subs(...).evalf()`, evaluate it compiled
+    inspector = CircuitInspector(qc)
+    values = np.random.rand(qc.num_parameters) * 2*np.pi
+    bound = qc.assign_parameters(dict(zip(qc.parameters, values)))
+    assert np.allclose(Operator(bound).data, inspector.compile('unitary')(values))
+    assert np.allclose(Statevector(bound).data, inspector.compile('statevector')(values))